@@ -8,19 +8,33 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+import importlib
+
 from dashboard.utils.db import get_connection
 from dashboard.components.sidebar import render_sidebar, show_import_result_dialog
-from dashboard.components.overview import render_overview
-from dashboard.components.activities import render_activities
-from dashboard.components.body import render_body
-from dashboard.components.weight import render_weight
-from dashboard.components.strength import render_strength
-from dashboard.components.nutrition import render_nutrition
-from dashboard.components.imports import render_imports
-from dashboard.components.mcp import render_mcp
-from dashboard.components.resting_hr import render_resting_hr
-from dashboard.components.vo2max import render_vo2max
-from dashboard.components.garmin_import import render_garmin_import
+
+# Tab label -> component module. Modules are imported the first time their
+# tab is shown, so plotly/altair/garminconnect stay off the startup path.
+TABS = {
+    "Overview": "overview",
+    "Activities": "activities",
+    "Body": "body",
+    "Weight": "weight",
+    "Resting HR": "resting_hr",
+    "VO2 Max": "vo2max",
+    "Strength": "strength",
+    "Nutrition": "nutrition",
+    "Garmin Import": "garmin_import",
+    "Imports": "imports",
+    "MCP": "mcp",
+}
+
+
+def render_tab(label: str, conn) -> None:
+    """Import a tab's component module and call its render_<module> function"""
+    module_name = TABS[label]
+    module = importlib.import_module(f"dashboard.components.{module_name}")
+    getattr(module, f"render_{module_name}")(conn)
 
 
 def main():
@@ -43,57 +57,15 @@ def main():
         st.warning("Database not found. Use 'Import Data' in the sidebar to create it.")
         return
 
-    # Main content tabs
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9, tab10, tab11 = st.tabs([
-        "Overview",
-        "Activities",
-        "Body",
-        "Weight",
-        "Resting HR",
-        "VO2 Max",
-        "Strength",
-        "Nutrition",
-        "Garmin Import",
-        "Imports",
-        "MCP"
-    ])
-
-    with tab1:
-        render_overview(conn)
-
-    with tab2:
-        render_activities(conn)
-
-    with tab3:
-        render_body(conn)
-
-    with tab4:
-        render_weight(conn)
-
-    with tab5:
-        render_resting_hr(conn)
-
-    with tab6:
-        render_vo2max(conn)
-
-    with tab7:
-        render_strength(conn)
-
-    with tab8:
-        render_nutrition(conn)
-
-    with tab9:
-        render_garmin_import(conn)
-
-    with tab10:
-        render_imports(conn)
-
-    with tab11:
-        render_mcp(conn)
-
-    # Close connection
-    if conn:
-        conn.close()
+    # Main content tabs - only the selected tab is rendered on each rerun
+    active_tab = st.radio(
+        "Tab",
+        options=list(TABS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_tab",
+    )
+    render_tab(active_tab, conn)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,5 @@
 """Activities tab component"""
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from dashboard.utils.queries import (
     get_activities_summary,
     get_activities_date_range,
@@ -45,66 +43,109 @@ def render_activities(conn):
 
     with col1:
         st.subheader("Activities by Type")
-        fig = px.bar(
+        st.bar_chart(
             summary_df,
             x="activity_type",
             y="count",
-            color="activity_type",
-            title=""
+            x_label="",
+            y_label="count",
+            height=300,
         )
-        fig.update_layout(showlegend=False, height=300)
-        st.plotly_chart(fig, width="stretch")
 
     with col2:
         st.subheader("Miles by Type")
-        fig = px.pie(
-            summary_df[summary_df["total_miles"] > 0],
-            values="total_miles",
-            names="activity_type",
-            title=""
-        )
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, width="stretch")
+        has_miles = summary_df["total_miles"] > 0
+        if has_miles.any():
+            st.vega_lite_chart(
+                summary_df[has_miles],
+                {
+                    "mark": {"type": "arc"},
+                    "encoding": {
+                        "theta": {"field": "total_miles", "type": "quantitative"},
+                        "color": {"field": "activity_type", "type": "nominal", "title": None},
+                        "tooltip": [
+                            {"field": "activity_type", "type": "nominal"},
+                            {"field": "total_miles", "type": "quantitative"},
+                        ],
+                    },
+                },
+                width="stretch",
+                height=300,
+            )
+        else:
+            st.info("No distance data")
 
     # Weekly trend
     st.subheader("Weekly Activity Volume")
     weekly_df = get_weekly_activities(conn)
 
     if not weekly_df.empty:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=weekly_df["week"],
-            y=weekly_df["activities"],
-            name="Activities",
-            mode="lines+markers"
-        ))
-        fig.add_trace(go.Scatter(
-            x=weekly_df["week"],
-            y=weekly_df["miles"],
-            name="Miles",
-            yaxis="y2",
-            mode="lines+markers"
-        ))
-        fig.update_layout(
-            yaxis=dict(title="Activities"),
-            yaxis2=dict(title="Miles", overlaying="y", side="right"),
+        # Hand-written spec: activities and miles on independent y axes
+        st.vega_lite_chart(
+            weekly_df,
+            {
+                "encoding": {"x": {"field": "week", "type": "ordinal", "title": None}},
+                "layer": [
+                    {
+                        "mark": {"type": "line", "point": True},
+                        "encoding": {
+                            "y": {"field": "activities", "type": "quantitative", "title": "Activities"},
+                            "color": {"datum": "Activities", "type": "nominal"},
+                        },
+                    },
+                    {
+                        "mark": {"type": "line", "point": True},
+                        "encoding": {
+                            "y": {
+                                "field": "miles",
+                                "type": "quantitative",
+                                "title": "Miles",
+                                "axis": {"orient": "right"},
+                            },
+                            "color": {"datum": "Miles", "type": "nominal"},
+                        },
+                    },
+                ],
+                "resolve": {"scale": {"y": "independent"}},
+                "config": {"legend": {"orient": "top", "title": None}},
+            },
+            width="stretch",
             height=300,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02)
         )
-        st.plotly_chart(fig, width="stretch")
 
     st.divider()
 
     # Summary table
     st.subheader("Activity Summary by Type")
-    display_df = summary_df.copy()
-    display_df.columns = ["Type", "Count", "Miles", "Calories", "Avg HR", "Avg Duration (min)"]
-    st.dataframe(display_df, width="stretch", hide_index=True)
+    st.dataframe(
+        summary_df,
+        width="stretch",
+        hide_index=True,
+        column_config={
+            "activity_type": "Type",
+            "count": "Count",
+            "total_miles": "Miles",
+            "total_calories": "Calories",
+            "avg_hr": "Avg HR",
+            "avg_duration_min": "Avg Duration (min)",
+        },
+    )
 
     # Recent activities
     st.subheader("Recent Activities")
     recent_df = get_recent_activities(conn, limit=15)
     if not recent_df.empty:
-        display_df = recent_df.copy()
-        display_df.columns = ["Date", "Type", "Title", "Miles", "Duration (min)", "Avg HR", "Calories"]
-        st.dataframe(display_df, width="stretch", hide_index=True)
+        st.dataframe(
+            recent_df,
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "start_time": "Date",
+                "type": "Type",
+                "title": "Title",
+                "distance_miles": "Miles",
+                "duration_min": "Duration (min)",
+                "avg_hr": "Avg HR",
+                "calories_total": "Calories",
+            },
+        )
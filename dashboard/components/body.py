@@ -1,7 +1,7 @@
 """Body measurements tab component"""
 import streamlit as st
 import plotly.express as px
-import plotly.graph_objects as go
+from dashboard.utils.db import cached_query
 from dashboard.utils.queries import (
     get_weight_trend,
     get_latest_weight,
@@ -10,6 +10,26 @@ from dashboard.utils.queries import (
 )
 
 
+@cached_query
+def _weight_summary(conn, days: int) -> dict:
+    """Linear trend line and net change for the weight trend period"""
+    import numpy as np
+
+    weight_df = get_weight_trend(conn, days=days)
+    weights = weight_df["weight_lbs"].to_numpy()
+    x_num = np.arange(len(weights))
+    # Rows with only body composition have no weight
+    has_weight = ~np.isnan(weights)
+
+    trend = None
+    if has_weight.sum() > 2:
+        trend = np.poly1d(np.polyfit(x_num[has_weight], weights[has_weight], 1))(x_num)
+
+    measured = weights[has_weight]
+    change = measured[-1] - measured[0] if len(measured) > 1 else None
+    return {"trend": trend, "change": change}
+
+
 def render_body(conn):
     """Render body measurements tab"""
     st.header("Body Measurements")
@@ -23,7 +43,7 @@ def render_body(conn):
 
     if latest:
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Current Weight", f"{latest['weight_lbs']:.1f} lbs")
+        col1.metric("Current Weight", f"{latest['weight_lbs']:.1f} lbs" if latest['weight_lbs'] else "N/A")
         col2.metric("Body Fat", f"{latest['body_fat_pct']:.1f}%" if latest['body_fat_pct'] else "N/A")
         col3.metric("Muscle Mass", f"{latest['muscle_mass_lbs']:.1f} lbs" if latest['muscle_mass_lbs'] else "N/A")
         col4.metric("Last Measured", latest['measurement_date'])
@@ -39,67 +59,45 @@ def render_body(conn):
     st.subheader("Weight Trend")
     weight_df = get_weight_trend(conn, days=days)
 
-    if not weight_df.empty:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=weight_df["date"],
-            y=weight_df["weight_lbs"],
-            name="Weight",
-            mode="lines+markers",
-            line=dict(color="blue")
-        ))
+    if weight_df["weight_lbs"].notna().any():
+        summary = _weight_summary(conn, days)
+        chart_df = weight_df[["date", "weight_lbs"]].rename(columns={"weight_lbs": "Weight"})
+        series = ["Weight"]
 
         # Add trend line
-        if len(weight_df) > 2:
-            import numpy as np
-            x_num = np.arange(len(weight_df))
-            z = np.polyfit(x_num, weight_df["weight_lbs"], 1)
-            p = np.poly1d(z)
-            fig.add_trace(go.Scatter(
-                x=weight_df["date"],
-                y=p(x_num),
-                name="Trend",
-                mode="lines",
-                line=dict(dash="dash", color="red")
-            ))
-
-        fig.update_layout(height=350, yaxis_title="Weight (lbs)")
-        st.plotly_chart(fig, width="stretch")
+        if summary["trend"] is not None:
+            chart_df["Trend"] = summary["trend"]
+            series.append("Trend")
+
+        st.line_chart(
+            chart_df,
+            x="date",
+            y=series,
+            x_label="",
+            y_label="Weight (lbs)",
+            color=["#1f77b4", "#d62728"][:len(series)],
+            height=350,
+        )
 
         # Show weight change
-        if len(weight_df) > 1:
-            first_weight = weight_df["weight_lbs"].iloc[0]
-            last_weight = weight_df["weight_lbs"].iloc[-1]
-            change = last_weight - first_weight
-            st.caption(f"Change over period: {change:+.1f} lbs")
+        if summary["change"] is not None:
+            st.caption(f"Change over period: {summary['change']:+.1f} lbs")
     else:
         st.info("No weight data for selected period")
 
     # Body composition
     st.subheader("Body Composition")
-    if not weight_df.empty and "body_fat_pct" in weight_df.columns:
-        col1, col2 = st.columns(2)
-
-        with col1:
-            fig = px.line(
-                weight_df,
-                x="date",
-                y="body_fat_pct",
-                title="Body Fat %"
-            )
-            fig.update_layout(height=250)
-            st.plotly_chart(fig, width="stretch")
-
-        with col2:
-            if "body_water_pct" in weight_df.columns:
-                fig = px.line(
-                    weight_df,
-                    x="date",
-                    y="body_water_pct",
-                    title="Body Water %"
-                )
-                fig.update_layout(height=250)
-                st.plotly_chart(fig, width="stretch")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if weight_df["body_fat_pct"].notna().any():
+            st.markdown("**Body Fat %**")
+            st.line_chart(weight_df, x="date", y="body_fat_pct", x_label="", y_label="", height=250)
+
+    with col2:
+        if weight_df["body_water_pct"].notna().any():
+            st.markdown("**Body Water %**")
+            st.line_chart(weight_df, x="date", y="body_water_pct", x_label="", y_label="", height=250)
 
     st.divider()
 
@@ -107,7 +105,7 @@ def render_body(conn):
     st.subheader("VO2 Max")
     vo2_df = get_vo2max_trend(conn)
 
-    if not vo2_df.empty:
+    if vo2_df["vo2max_value"].notna().any():
         fig = px.line(
             vo2_df,
             x="date",
@@ -129,14 +127,7 @@ def render_body(conn):
     rhr_df = get_resting_hr_trend(conn, days=days)
 
     if not rhr_df.empty:
-        fig = px.line(
-            rhr_df,
-            x="date",
-            y="resting_hr",
-            markers=True
-        )
-        fig.update_layout(height=250, yaxis_title="BPM")
-        st.plotly_chart(fig, width="stretch")
+        st.line_chart(rhr_df, x="date", y="resting_hr", x_label="", y_label="BPM", height=250)
 
         avg_rhr = rhr_df["resting_hr"].mean()
         st.caption(f"Average: {avg_rhr:.0f} bpm")
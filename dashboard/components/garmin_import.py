@@ -1,25 +1,65 @@
 """Garmin Import tab component"""
-import streamlit as st
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import date, timedelta
 
-from health_import.garmin.vo2max import GarminVO2MaxFetcher, import_vo2max_to_db
-from health_import.garmin.activities import GarminActivityFetcher, import_activities_to_db
-from health_import.garmin.weight import GarminWeightFetcher, import_weight_to_db, convert_api_weight
+import streamlit as st
+
+from dashboard.utils.db import clear_query_cache, write_transaction
+from dashboard.utils.garmin import get_fetcher, reset_fetchers
+
+from health_import.garmin.vo2max import import_vo2max_to_db
+from health_import.garmin.activities import fetch_splits_for_import, import_activities_to_db
+from health_import.garmin.weight import import_weight_to_db, convert_api_weight
+
+
+class _StatusLog:
+    """Collects progress lines from a worker thread.
+
+    Streamlit elements can only be written from the script thread, so
+    workers write here and the script thread replays the lines into
+    st.status while the import runs.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self._shown = 0
+
+    def write(self, text: str) -> None:
+        self.lines.append(text)
+
+    def replay(self, status) -> None:
+        """Write lines added since the last replay into status"""
+        new_lines = self.lines[self._shown:]
+        self._shown += len(new_lines)
+        for line in new_lines:
+            status.write(line)
+
+
+# Source IDs already present in the database, keyed by (connection id, name);
+# the shared connections live as long as the server, so their ids are stable
+_source_ids = {}
 
 
 def _get_source_id(conn, source_name: str) -> int:
     """Get or create data source ID"""
+    key = (id(conn), source_name)
+    if key in _source_ids:
+        return _source_ids[key]
+
     row = conn.execute(
         "SELECT id FROM data_sources WHERE name = ?", (source_name,)
     ).fetchone()
     if row:
+        _source_ids[key] = row[0]
         return row[0]
     # Create if missing
-    cursor = conn.execute(
-        "INSERT INTO data_sources (name, description) VALUES (?, ?)",
-        (source_name, f"Garmin Connect API - {source_name}")
-    )
-    conn.commit()
+    with write_transaction(conn):
+        cursor = conn.execute(
+            "INSERT INTO data_sources (name, description) VALUES (?, ?)",
+            (source_name, f"Garmin Connect API - {source_name}")
+        )
+    # Remember the new row only once it has been committed
+    _source_ids[key] = cursor.lastrowid
     return cursor.lastrowid
 
 
@@ -28,11 +68,12 @@ def render_garmin_import(conn):
     col_header, col_reload = st.columns([6, 1])
     col_header.header("Garmin Import")
     if col_reload.button("Reload", key="garmin_reload"):
+        reset_fetchers()
         st.rerun()
 
     # Check login status
-    fetcher = GarminVO2MaxFetcher()
-    logged_in = fetcher.is_logged_in()
+    fetcher = get_fetcher("vo2max")
+    logged_in = fetcher.client is not None
 
     if logged_in:
         st.success(f"Logged in as {fetcher.get_user_name()}")
@@ -94,33 +135,49 @@ def render_garmin_import(conn):
     if "garmin_results" not in st.session_state:
         st.session_state.garmin_results = {}
 
-    # Handle imports
-    if import_activities or import_all:
-        with st.status("Importing activities...", expanded=True) as status:
-            result = _import_activities(conn, start_date, end_date, status)
-            st.session_state.garmin_results["activities"] = result
-            if "error" in result:
-                status.update(label="Activities: Error", state="error")
-            else:
-                status.update(label=f"Activities: {result.get('inserted', 0)} new, {result.get('skipped', 0)} skipped", state="complete")
-
-    if import_vo2max or import_all:
-        with st.status("Importing VO2 Max...", expanded=True) as status:
-            result = _import_vo2max(conn, start_date, end_date, status)
-            st.session_state.garmin_results["vo2max"] = result
-            if "error" in result:
-                status.update(label="VO2 Max: Error", state="error")
-            else:
-                status.update(label=f"VO2 Max: {result.get('inserted', 0)} new, {result.get('skipped', 0)} skipped", state="complete")
-
-    if import_weight or import_all:
-        with st.status("Importing weight...", expanded=True) as status:
-            result = _import_weight(conn, start_date, end_date, status)
-            st.session_state.garmin_results["weight"] = result
-            if "error" in result:
-                status.update(label="Weight: Error", state="error")
-            else:
-                status.update(label=f"Weight: {result.get('inserted', 0)} new, {result.get('skipped', 0)} skipped", state="complete")
+    # Handle imports - fetches run concurrently, DB writes one at a time
+    # under the shared connection's write transaction
+    imports = {
+        "activities": ("Activities", _import_activities, import_activities),
+        "vo2max": ("VO2 Max", _import_vo2max, import_vo2max),
+        "weight": ("Weight", _import_weight, import_weight),
+    }
+    selected = [key for key, (_, _, clicked) in imports.items() if clicked or import_all]
+
+    if selected:
+        source_id = _get_source_id(conn, "garmin_api")
+
+        with ThreadPoolExecutor(max_workers=len(selected)) as pool:
+            futures = {}
+            for key in selected:
+                label, import_func, _ = imports[key]
+                status = st.status(f"Importing {label}...", expanded=True)
+                log = _StatusLog()
+                future = pool.submit(
+                    import_func, conn, get_fetcher(key), source_id, start_date, end_date, log
+                )
+                futures[future] = (key, label, status, log)
+
+            # Show worker progress as it arrives, finishing each import's
+            # status once its future is done
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                for _, _, status, log in futures.values():
+                    log.replay(status)
+
+                for future in done:
+                    key, label, status, log = futures[future]
+                    result = future.result()
+                    st.session_state.garmin_results[key] = result
+                    if "error" in result:
+                        status.update(label=f"{label}: Error", state="error")
+                    else:
+                        status.update(label=f"{label}: {result.get('inserted', 0)} new, {result.get('skipped', 0)} skipped", state="complete")
+
+    # Imported rows invalidate cached dashboard queries
+    if import_activities or import_vo2max or import_weight or import_all:
+        clear_query_cache()
 
     # Display results
     with results_container:
@@ -150,37 +207,36 @@ def render_garmin_import(conn):
                     st.success(f"{key.title()}: {', '.join(parts)}")
 
 
-def _import_activities(conn, start_date: date, end_date: date, status) -> dict:
+def _import_activities(conn, fetcher, source_id: int, start_date: date, end_date: date, status) -> dict:
     """Import activities from Garmin"""
     try:
-        fetcher = GarminActivityFetcher()
-        if not fetcher.is_logged_in():
+        if fetcher.client is None:
             return {"error": "Not logged in"}
 
         status.write(f"Fetching activities from {start_date} to {end_date}...")
-        source_id = _get_source_id(conn, "garmin_api")
         activities = fetcher.fetch_activities(start_date, end_date)
 
         if not activities:
             status.write("No activities found in date range")
             return {"processed": 0, "inserted": 0, "skipped": 0, "laps_inserted": 0}
 
-        status.write(f"Found {len(activities)} activities, importing with laps...")
-        result = import_activities_to_db(conn, fetcher, activities, source_id, status)
+        status.write(f"Found {len(activities)} activities, fetching laps...")
+        # Download laps before taking the write lock; only the inserts hold it
+        splits = fetch_splits_for_import(conn, fetcher, activities, status)
+        with write_transaction(conn):
+            result = import_activities_to_db(conn, fetcher, activities, source_id, status, splits=splits)
         return result
     except Exception as e:
         return {"error": str(e)}
 
 
-def _import_vo2max(conn, start_date: date, end_date: date, status) -> dict:
+def _import_vo2max(conn, fetcher, source_id: int, start_date: date, end_date: date, status) -> dict:
     """Import VO2 Max from Garmin"""
     try:
-        fetcher = GarminVO2MaxFetcher()
-        if not fetcher.is_logged_in():
+        if fetcher.client is None:
             return {"error": "Not logged in"}
 
         status.write(f"Fetching VO2 Max from {start_date} to {end_date}...")
-        source_id = _get_source_id(conn, "garmin_api")
         readings = fetcher.fetch_vo2max(start_date=start_date, end_date=end_date)
 
         if not readings:
@@ -188,21 +244,20 @@ def _import_vo2max(conn, start_date: date, end_date: date, status) -> dict:
             return {"processed": 0, "inserted": 0, "skipped": 0}
 
         status.write(f"Found {len(readings)} readings, importing...")
-        result = import_vo2max_to_db(conn, readings, source_id)
+        with write_transaction(conn):
+            result = import_vo2max_to_db(conn, readings, source_id)
         return result
     except Exception as e:
         return {"error": str(e)}
 
 
-def _import_weight(conn, start_date: date, end_date: date, status) -> dict:
+def _import_weight(conn, fetcher, source_id: int, start_date: date, end_date: date, status) -> dict:
     """Import weight from Garmin"""
     try:
-        fetcher = GarminWeightFetcher()
-        if not fetcher.is_logged_in():
+        if fetcher.client is None:
             return {"error": "Not logged in"}
 
         status.write(f"Fetching weight from {start_date} to {end_date}...")
-        source_id = _get_source_id(conn, "garmin_api")
         api_entries = fetcher.fetch_weight(start_date, end_date)
 
         if not api_entries:
@@ -212,7 +267,8 @@ def _import_weight(conn, start_date: date, end_date: date, status) -> dict:
         status.write(f"Found {len(api_entries)} entries, importing...")
         # Convert API format to standard format
         entries = [convert_api_weight(e) for e in api_entries]
-        result = import_weight_to_db(conn, entries, source_id)
+        with write_transaction(conn):
+            result = import_weight_to_db(conn, entries, source_id)
         return result
     except Exception as e:
         return {"error": str(e)}
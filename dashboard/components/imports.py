@@ -1,6 +1,5 @@
 """Import management tab component"""
 import streamlit as st
-import pandas as pd
 from dashboard.utils.queries import (
     get_all_imports,
     get_conflicts_detail,
@@ -54,22 +53,25 @@ def render_imports(conn):
     st.divider()
 
     # Import table
-    display_df = imports_df[[
-        "id", "source", "import_timestamp", "records_processed",
-        "records_inserted", "records_skipped", "records_conflicted", "status"
-    ]].copy()
-    display_df.columns = ["ID", "Source", "Timestamp", "Processed", "Inserted", "Skipped", "Conflicts", "Status"]
-
-    # Color status
-    def status_color(status):
-        if status == "completed":
-            return "✅"
-        elif status == "failed":
-            return "❌"
-        return "⏳"
-
-    display_df["Status"] = display_df["Status"].apply(status_color)
-    st.dataframe(display_df, width="stretch", hide_index=True)
+    st.dataframe(
+        imports_df,
+        width="stretch",
+        hide_index=True,
+        column_order=[
+            "id", "source", "import_timestamp", "records_processed",
+            "records_inserted", "records_skipped", "records_conflicted", "status_icon",
+        ],
+        column_config={
+            "id": "ID",
+            "source": "Source",
+            "import_timestamp": "Timestamp",
+            "records_processed": "Processed",
+            "records_inserted": "Inserted",
+            "records_skipped": "Skipped",
+            "records_conflicted": "Conflicts",
+            "status_icon": "Status",
+        },
+    )
 
     st.divider()
 
@@ -91,9 +93,18 @@ def render_imports(conn):
 
         with col2:
             # Show recent conflicts
-            display_df = conflicts_df[["id", "table_name", "record_key", "conflict_fields"]].head(20)
-            display_df.columns = ["ID", "Table", "Record Key", "Fields"]
-            st.dataframe(display_df, width="stretch", hide_index=True)
+            st.dataframe(
+                conflicts_df.head(20),
+                width="stretch",
+                hide_index=True,
+                column_order=["id", "table_name", "record_key", "conflict_fields"],
+                column_config={
+                    "id": "ID",
+                    "table_name": "Table",
+                    "record_key": "Record Key",
+                    "conflict_fields": "Fields",
+                },
+            )
 
         # Expandable conflict detail
         with st.expander("View Conflict Values"):
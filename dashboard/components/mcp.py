@@ -1,36 +1,41 @@
 """MCP Activity tab component - shows MCP request/response activity"""
 import streamlit as st
-import pandas as pd
 import json
 
+from dashboard.utils.db import cached_query
 
-def get_mcp_requests(conn, limit: int = 50) -> pd.DataFrame:
-    """Get recent MCP requests from database"""
+
+# Rows shown per page of request history
+PAGE_SIZE = 50
+
+
+@cached_query
+def get_mcp_requests(conn, page: int = 1, page_size: int = PAGE_SIZE) -> list:
+    """Get one page of recent MCP requests from database"""
     query = """
-    SELECT id, timestamp, tool_name, params, response, response_tokens, duration_ms
+    SELECT id, strftime('%Y-%m-%d %H:%M:%S', timestamp) as timestamp,
+           tool_name, params, response, response_tokens, duration_ms,
+           CASE WHEN params IS NULL OR params = '' THEN '-'
+                WHEN length(params) > 50 THEN substr(params, 1, 50) || '...'
+                ELSE params END as params_short
     FROM mcp_requests
     ORDER BY timestamp DESC
-    LIMIT ?
+    LIMIT ? OFFSET ?
     """
     try:
-        return pd.read_sql_query(query, conn, params=(limit,))
+        cursor = conn.execute(query, (page_size, (page - 1) * page_size))
+        return [tuple(row) for row in cursor.fetchmany(page_size)]
     except Exception:
-        return pd.DataFrame()
+        return []
 
 
+@cached_query
 def get_mcp_stats(conn) -> dict:
     """Get MCP usage statistics"""
     try:
-        stats = conn.execute("""
-            SELECT
-                COUNT(*) as total_requests,
-                SUM(response_tokens) as total_tokens,
-                AVG(response_tokens) as avg_tokens,
-                AVG(duration_ms) as avg_duration_ms
-            FROM mcp_requests
-        """).fetchone()
-
-        by_tool = conn.execute("""
+        # One pass: per-tool aggregates, with grand totals carried on every
+        # row by window functions over the grouped result
+        rows = conn.execute("""
             SELECT tool_name,
                    COUNT(*) as count,
                    SUM(response_tokens) as total_tokens,
@@ -38,18 +43,26 @@ def get_mcp_stats(conn) -> dict:
                    MIN(response_tokens) as min_tokens,
                    MAX(response_tokens) as max_tokens,
                    AVG(duration_ms) as avg_ms,
-                   MAX(timestamp) as last_used
+                   strftime('%m-%d %H:%M', MAX(timestamp)) as last_used,
+                   SUM(COUNT(*)) OVER () as all_requests,
+                   SUM(SUM(response_tokens)) OVER () as all_tokens,
+                   SUM(SUM(response_tokens)) OVER () * 1.0
+                       / SUM(COUNT(response_tokens)) OVER () as all_avg_tokens,
+                   SUM(SUM(duration_ms)) OVER () * 1.0
+                       / SUM(COUNT(duration_ms)) OVER () as all_avg_ms
             FROM mcp_requests
             GROUP BY tool_name
             ORDER BY count DESC
         """).fetchall()
 
+        totals = rows[0][8:] if rows else (0, 0, 0, 0)
         return {
-            "total": stats[0] or 0,
-            "total_tokens": stats[1] or 0,
-            "avg_tokens": stats[2] or 0,
-            "avg_duration": stats[3] or 0,
-            "by_tool": by_tool,
+            "total": totals[0] or 0,
+            "total_tokens": totals[1] or 0,
+            "avg_tokens": totals[2] or 0,
+            "avg_duration": totals[3] or 0,
+            # Plain tuples: sqlite3.Row can't be pickled into the cache
+            "by_tool": [tuple(row)[:8] for row in rows],
         }
     except Exception:
         return {"total": 0, "total_tokens": 0, "avg_tokens": 0, "avg_duration": 0, "by_tool": []}
@@ -63,6 +76,8 @@ def render_mcp(conn):
     with col_btn:
         st.write("")  # spacer
         if st.button("🔄 Reload", key="mcp_reload"):
+            get_mcp_stats.clear()
+            get_mcp_requests.clear()
             st.rerun()
 
     if conn is None:
@@ -92,7 +107,6 @@ def render_mcp(conn):
         st.subheader("Requests by Tool")
         tool_data = []
         for row in stats["by_tool"]:
-            last_used = pd.to_datetime(row[7]).strftime("%m-%d %H:%M") if row[7] else "-"
             tool_data.append({
                 "Tool": row[0],
                 "Count": row[1],
@@ -101,76 +115,82 @@ def render_mcp(conn):
                 "Min": row[4] or "-",
                 "Max": row[5] or "-",
                 "Avg ms": f"{row[6]:.0f}" if row[6] else "-",
-                "Last Used": last_used,
+                "Last Used": row[7] or "-",
             })
-        st.dataframe(pd.DataFrame(tool_data), width="stretch", hide_index=True)
+        st.dataframe(tool_data, width="stretch", hide_index=True)
 
         st.divider()
 
-    # Get recent requests
-    df = get_mcp_requests(conn)
-
-    if df.empty:
+    if not stats["total"]:
         st.info("No MCP requests recorded yet.")
         return
 
     # Request history table
-    st.subheader("Request History")
-
-    # Format for display
-    display_df = df.copy()
-    display_df["Timestamp"] = pd.to_datetime(display_df["timestamp"]).dt.strftime("%Y-%m-%d %H:%M:%S")
-    display_df["Params (truncated)"] = display_df["params"].apply(
-        lambda x: (x[:50] + "...") if x and len(x) > 50 else (x or "-")
-    )
-
-    # Select columns for display
-    history_df = display_df[["Timestamp", "tool_name", "Params (truncated)", "response_tokens", "duration_ms"]]
-    history_df.columns = ["Timestamp", "Tool", "Params", "Tokens", "Duration (ms)"]
+    col_header, col_page = st.columns([4, 1])
+    with col_header:
+        st.subheader("Request History")
+    with col_page:
+        pages = (stats["total"] + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="mcp_page")
+
+    # Only the visible page is fetched
+    rows = get_mcp_requests(conn, page=int(page))
+    if not rows:
+        st.info("No MCP requests recorded yet.")
+        return
 
     # Show table with row selection
     selection = st.dataframe(
-        history_df,
+        [
+            {
+                "Timestamp": ts,
+                "Tool": tool,
+                "Params": params_short,
+                "Tokens": tokens,
+                "Duration (ms)": duration,
+            }
+            for _, ts, tool, _, _, tokens, duration, params_short in rows
+        ],
         width="stretch",
         hide_index=True,
         selection_mode="single-row",
         on_select="rerun",
     )
 
-    # Get selected row index (default to 0 if none selected)
+    # Get selected row index (default to 0 if none selected, or if the
+    # selection is left over from a longer page)
     selected_rows = selection.selection.rows
-    selected_idx = selected_rows[0] if selected_rows else 0
+    selected_idx = selected_rows[0] if selected_rows and selected_rows[0] < len(rows) else 0
 
     st.divider()
 
     # Request/Response detail for selected row
     st.subheader("Request Detail")
-    selected = df.iloc[selected_idx]
-    sel_ts = pd.to_datetime(selected["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+    _, sel_ts, sel_tool, sel_params, sel_response, sel_tokens, sel_duration, _ = rows[selected_idx]
 
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Timestamp", sel_ts)
-    col2.metric("Tool", selected["tool_name"])
-    col3.metric("Tokens", selected["response_tokens"])
-    col4.metric("Duration", f"{selected['duration_ms']}ms")
+    col2.metric("Tool", sel_tool)
+    col3.metric("Tokens", sel_tokens)
+    col4.metric("Duration", f"{sel_duration}ms")
 
     col1, col2 = st.columns(2)
     with col1:
         st.write("**Parameters:**")
-        if selected["params"]:
+        if sel_params:
             try:
-                st.json(json.loads(selected["params"]))
+                st.json(json.loads(sel_params))
             except:
-                st.code(selected["params"])
+                st.code(sel_params)
         else:
             st.write("-")
 
     with col2:
         st.write("**Response:**")
-        if selected["response"]:
+        if sel_response:
             try:
-                st.json(json.loads(selected["response"]))
+                st.json(json.loads(sel_response))
             except:
-                st.code(selected["response"])
+                st.code(sel_response)
         else:
             st.write("-")
@@ -9,6 +9,18 @@ from dashboard.utils.queries import (
 )
 
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _macro_pie(protein: float, fat: float, carbs: float):
+    """Build the macro split pie; the averages are rounded so reruns hit the cache"""
+    fig = px.pie(
+        values=[protein, fat, carbs],
+        names=["Protein", "Fat", "Carbs"],
+        title="Avg Macro Split"
+    )
+    fig.update_layout(height=250)
+    return fig
+
+
 def render_nutrition(conn):
     """Render nutrition tab"""
     st.header("Nutrition")
@@ -40,14 +52,16 @@ def render_nutrition(conn):
     st.subheader("Calorie Intake")
     nutrition_df = get_nutrition_summary(conn, days=days)
 
+    # Plain arrays for the traces, extracted once
+    dates = nutrition_df["date"].to_numpy()
+
     if not nutrition_df.empty:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=nutrition_df["date"],
-            y=nutrition_df["calories"],
+        fig = go.Figure(data=[go.Scattergl(
+            x=dates,
+            y=nutrition_df["calories"].to_numpy(),
             name="Calories",
             mode="lines+markers"
-        ))
+        )])
         fig.update_layout(height=300, yaxis_title="Calories (kcal)")
         st.plotly_chart(fig, width="stretch")
 
@@ -59,19 +73,10 @@ def render_nutrition(conn):
 
     with col1:
         if not nutrition_df.empty:
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=nutrition_df["date"], y=nutrition_df["protein_g"],
-                name="Protein", mode="lines"
-            ))
-            fig.add_trace(go.Scatter(
-                x=nutrition_df["date"], y=nutrition_df["fat_g"],
-                name="Fat", mode="lines"
-            ))
-            fig.add_trace(go.Scatter(
-                x=nutrition_df["date"], y=nutrition_df["carbs_g"],
-                name="Carbs", mode="lines"
-            ))
+            fig = go.Figure(data=[
+                go.Scattergl(x=dates, y=nutrition_df[column].to_numpy(), name=name, mode="lines")
+                for column, name in [("protein_g", "Protein"), ("fat_g", "Fat"), ("carbs_g", "Carbs")]
+            ])
             fig.update_layout(height=250, yaxis_title="Grams")
             st.plotly_chart(fig, width="stretch")
 
@@ -83,14 +88,9 @@ def render_nutrition(conn):
                 avgs.get("avg_fat", 0) or 0,
                 avgs.get("avg_carbs", 0) or 0,
             ]
-            if sum(macro_vals) > 0:
-                fig = px.pie(
-                    values=macro_vals,
-                    names=["Protein", "Fat", "Carbs"],
-                    title="Avg Macro Split"
-                )
-                fig.update_layout(height=250)
-                st.plotly_chart(fig, width="stretch")
+            # A split needs at least two macros; one alone is a full circle
+            if sum(v > 0 for v in macro_vals) >= 2:
+                st.plotly_chart(_macro_pie(*macro_vals), width="stretch")
 
     st.divider()
 
@@ -23,15 +23,15 @@ def render_overview(conn):
 
     if not source_df.empty:
         cols = st.columns(3)
-        for i, row in source_df.iterrows():
+        for i, row in enumerate(source_df.itertuples(index=False)):
             col = cols[i % 3]
             with col:
-                total = row['total_records']
-                total = 0 if pd.isna(total) else int(total)
+                total = 0 if pd.isna(row.total_records) else int(row.total_records)
+                last_import = row.last_import[:10] if pd.notna(row.last_import) else "Never"
                 st.metric(
-                    label=row["source"].replace("_", " ").title(),
+                    label=row.source.replace("_", " ").title(),
                     value=f"{total:,} records",
-                    delta=f"Last: {row['last_import'][:10] if row['last_import'] else 'Never'}"
+                    delta=f"Last: {last_import}"
                 )
 
     st.divider()
@@ -41,18 +41,19 @@ def render_overview(conn):
     table_df = get_table_stats(conn)
 
     if not table_df.empty:
-        # Format as cards
-        cols = st.columns(3)
-        for i, row in table_df.iterrows():
-            col = cols[i % 3]
-            with col:
-                with st.container(border=True):
-                    st.markdown(f"**{row['category']}**")
-                    st.write(f"Records: {int(row['records']):,}")
-                    if row['earliest'] and row['latest']:
-                        st.caption(f"{row['earliest']} → {row['latest']}")
-                    else:
-                        st.caption("No data")
+        # One table rather than a card of elements per row
+        date_range = (table_df["earliest"] + " → " + table_df["latest"]).fillna("No data")
+        st.dataframe(
+            table_df.assign(date_range=date_range),
+            width="stretch",
+            hide_index=True,
+            column_order=["category", "records", "date_range"],
+            column_config={
+                "category": "Data",
+                "records": st.column_config.NumberColumn("Records", format="localized"),
+                "date_range": "Date Range",
+            },
+        )
 
     st.divider()
 
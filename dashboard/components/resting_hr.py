@@ -1,61 +1,68 @@
 """Resting Heart Rate tab component"""
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from typing import Optional
 
+from dashboard.utils.db import cached_query
 
-def get_resting_hr_data(conn, include_hidden: bool = False) -> pd.DataFrame:
-    """Get resting HR data, optionally including hidden records"""
-    if include_hidden:
-        query = """
-        SELECT measurement_date as date, resting_hr as hr, source_name,
-               COALESCE(hidden, 0) as hidden
-        FROM resting_heart_rate
-        ORDER BY measurement_date
-        """
-    else:
-        query = """
-        SELECT measurement_date as date, resting_hr as hr, source_name,
-               0 as hidden
-        FROM resting_heart_rate
-        WHERE hidden = 0 OR hidden IS NULL
-        ORDER BY measurement_date
-        """
+
+@cached_query
+def get_resting_hr_records(conn, hidden: bool = False, limit: Optional[int] = None) -> pd.DataFrame:
+    """Get individual visible or hidden resting HR records, newest first"""
+    where_clause = "hidden = 1" if hidden else "COALESCE(hidden, 0) = 0"
+    query = f"""
+    SELECT measurement_date as date, resting_hr as hr, source_name
+    FROM resting_heart_rate
+    WHERE {where_clause}
+    ORDER BY measurement_date DESC
+    LIMIT ?
+    """
+    # LIMIT -1 means no limit in SQLite
+    return pd.read_sql_query(query, conn, params=(limit or -1,), dtype={"hr": "int16"})
+
+
+@cached_query
+def get_daily_rhr(conn, max_points: int = 2000) -> pd.DataFrame:
+    """Get visible resting HR averaged per day, or per week when there are
+    more than max_points days to plot"""
+    days = conn.execute(
+        "SELECT COUNT(DISTINCT measurement_date) FROM resting_heart_rate WHERE COALESCE(hidden, 0) = 0"
+    ).fetchone()[0]
+    bucket = "measurement_date" if days <= max_points else "strftime('%Y-%W', measurement_date)"
+
+    query = f"""
+    SELECT MIN(measurement_date) as date,
+           AVG(resting_hr) as hr,
+           MIN(resting_hr) as min_hr,
+           MAX(resting_hr) as max_hr
+    FROM resting_heart_rate
+    WHERE COALESCE(hidden, 0) = 0
+    GROUP BY {bucket}
+    ORDER BY date
+    """
     return pd.read_sql_query(query, conn)
 
 
+@cached_query
 def get_resting_hr_stats(conn) -> dict:
     """Get resting HR statistics (excluding hidden records)"""
+    # Visible-record aggregates and the hidden count in one pass
     query = """
     SELECT
-        COUNT(*) as count,
-        MIN(measurement_date) as earliest,
-        MAX(measurement_date) as latest,
-        AVG(resting_hr) as avg_hr,
-        MIN(resting_hr) as min_hr,
-        MAX(resting_hr) as max_hr
+        COUNT(CASE WHEN COALESCE(hidden, 0) = 0 THEN 1 END) as count,
+        COUNT(CASE WHEN hidden = 1 THEN 1 END) as hidden_count,
+        MIN(CASE WHEN COALESCE(hidden, 0) = 0 THEN measurement_date END) as earliest,
+        MAX(CASE WHEN COALESCE(hidden, 0) = 0 THEN measurement_date END) as latest,
+        AVG(CASE WHEN COALESCE(hidden, 0) = 0 THEN resting_hr END) as avg_hr,
+        MIN(CASE WHEN COALESCE(hidden, 0) = 0 THEN resting_hr END) as min_hr,
+        MAX(CASE WHEN COALESCE(hidden, 0) = 0 THEN resting_hr END) as max_hr
     FROM resting_heart_rate
-    WHERE hidden = 0 OR hidden IS NULL
     """
-    row = conn.execute(query).fetchone()
-
-    # Count hidden records
-    hidden_count = conn.execute(
-        "SELECT COUNT(*) FROM resting_heart_rate WHERE hidden = 1"
-    ).fetchone()[0]
-
-    return {
-        "count": row[0] or 0,
-        "hidden_count": hidden_count or 0,
-        "earliest": row[1],
-        "latest": row[2],
-        "avg_hr": row[3],
-        "min_hr": row[4],
-        "max_hr": row[5],
-    }
+    return dict(conn.execute(query).fetchone())
 
 
+@cached_query
 def get_monthly_avg(conn) -> pd.DataFrame:
     """Get monthly average resting HR (excluding hidden)"""
     query = """
@@ -65,7 +72,7 @@ def get_monthly_avg(conn) -> pd.DataFrame:
            MAX(resting_hr) as max_hr,
            COUNT(*) as count
     FROM resting_heart_rate
-    WHERE hidden = 0 OR hidden IS NULL
+    WHERE COALESCE(hidden, 0) = 0
     GROUP BY month
     ORDER BY month
     """
@@ -77,25 +84,26 @@ def render_resting_hr(conn):
     col_header, col_reload = st.columns([6, 1])
     col_header.header("Resting Heart Rate")
     if col_reload.button("🔄 Reload", key="rhr_reload"):
+        get_resting_hr_records.clear()
+        get_daily_rhr.clear()
+        get_resting_hr_stats.clear()
+        get_monthly_avg.clear()
         st.rerun()
 
     if conn is None:
         st.warning("No database connection")
         return
 
-    # Check if table has data
+    # Stats, also used to check if table has data
     try:
-        count = conn.execute("SELECT COUNT(*) FROM resting_heart_rate").fetchone()[0]
-        if count == 0:
-            st.info("No resting heart rate data yet. Import Apple Health data to populate.")
-            return
+        stats = get_resting_hr_stats(conn)
     except Exception:
+        stats = None
+
+    if not stats or stats["count"] + stats["hidden_count"] == 0:
         st.info("No resting heart rate data yet. Import Apple Health data to populate.")
         return
 
-    # Stats
-    stats = get_resting_hr_stats(conn)
-
     col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
     col1.metric("Records", f"{stats['count']:,}")
     col2.metric("Hidden", f"{stats['hidden_count']:,}")
@@ -107,33 +115,27 @@ def render_resting_hr(conn):
 
     st.divider()
 
-    # Get all data including hidden
-    df = get_resting_hr_data(conn, include_hidden=True)
-
-    if df.empty:
-        return
-
-    # Split into visible and hidden
-    df_visible = df[df["hidden"] == 0]
-    df_hidden = df[df["hidden"] == 1]
+    # Hidden records are few and shown individually
+    df_hidden = get_resting_hr_records(conn, hidden=True) if stats["hidden_count"] else None
 
     # Daily chart
     st.subheader("Daily Resting Heart Rate")
     fig = go.Figure()
 
-    # Visible records (solid red line)
-    if not df_visible.empty:
-        fig.add_trace(go.Scatter(
-            x=df_visible["date"],
-            y=df_visible["hr"],
+    # Visible records (solid red line), downsampled in SQL for long histories
+    daily_df = get_daily_rhr(conn)
+    if not daily_df.empty:
+        fig.add_trace(go.Scattergl(
+            x=daily_df["date"],
+            y=daily_df["hr"],
             name="Visible",
             mode="lines",
             line=dict(color="#e74c3c", width=1.5),
-            hovertemplate="Date: %{x}<br>HR: %{y} bpm<extra></extra>"
+            hovertemplate="Date: %{x}<br>HR: %{y:.0f} bpm<extra></extra>"
         ))
 
     # Hidden records (gray markers)
-    if not df_hidden.empty:
+    if df_hidden is not None:
         fig.add_trace(go.Scatter(
             x=df_hidden["date"],
             y=df_hidden["hr"],
@@ -156,28 +158,30 @@ def render_resting_hr(conn):
     monthly_df = get_monthly_avg(conn)
 
     if not monthly_df.empty:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=monthly_df["month"],
-            y=monthly_df["avg_hr"],
-            name="Average",
-            mode="lines+markers",
-            line=dict(color="#e74c3c")
-        ))
-        fig.add_trace(go.Scatter(
-            x=monthly_df["month"],
-            y=monthly_df["min_hr"],
-            name="Min",
-            mode="lines",
-            line=dict(color="#3498db", dash="dot")
-        ))
-        fig.add_trace(go.Scatter(
-            x=monthly_df["month"],
-            y=monthly_df["max_hr"],
-            name="Max",
-            mode="lines",
-            line=dict(color="#e67e22", dash="dot")
-        ))
+        months = monthly_df["month"].to_numpy()
+        fig = go.Figure(data=[
+            go.Scatter(
+                x=months,
+                y=monthly_df["avg_hr"].to_numpy(),
+                name="Average",
+                mode="lines+markers",
+                line=dict(color="#e74c3c")
+            ),
+            go.Scatter(
+                x=months,
+                y=monthly_df["min_hr"].to_numpy(),
+                name="Min",
+                mode="lines",
+                line=dict(color="#3498db", dash="dot")
+            ),
+            go.Scatter(
+                x=months,
+                y=monthly_df["max_hr"].to_numpy(),
+                name="Max",
+                mode="lines",
+                line=dict(color="#e67e22", dash="dot")
+            ),
+        ])
         fig.update_layout(
             height=350,
             yaxis_title="Resting HR (bpm)",
@@ -189,13 +193,15 @@ def render_resting_hr(conn):
 
     # Recent records table (visible only)
     st.subheader("Recent Records")
-    recent_df = df_visible.tail(30).iloc[::-1][["date", "hr", "source_name"]].copy()
-    recent_df.columns = ["Date", "Resting HR (bpm)", "Source"]
-    st.dataframe(recent_df, width="stretch", hide_index=True)
+    record_columns = {"date": "Date", "hr": "Resting HR (bpm)", "source_name": "Source"}
+    st.dataframe(
+        get_resting_hr_records(conn, limit=30),
+        width="stretch",
+        hide_index=True,
+        column_config=record_columns,
+    )
 
     # Hidden records table (if any)
-    if not df_hidden.empty:
+    if df_hidden is not None:
         with st.expander(f"Hidden Records ({len(df_hidden)})"):
-            hidden_df = df_hidden.iloc[::-1][["date", "hr", "source_name"]].copy()
-            hidden_df.columns = ["Date", "Resting HR (bpm)", "Source"]
-            st.dataframe(hidden_df, width="stretch", hide_index=True)
+            st.dataframe(df_hidden, width="stretch", hide_index=True, column_config=record_columns)
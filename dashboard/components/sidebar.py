@@ -1,18 +1,74 @@
 """Sidebar component with DB toggle and import controls"""
 import streamlit as st
 from pathlib import Path
+import importlib
+import re
+import shutil
 import tempfile
 import sys
-import csv
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from dashboard.utils.db import DB_PATHS
+from dashboard.utils.db import DB_PATHS, clear_query_cache
+
+# Import sources and their display labels
+SOURCE_OPTIONS = {
+    "garmin-activities": "Garmin Activities (CSV)",
+    "garmin-weight": "Garmin Weight (CSV)",
+    "garmin-vo2max": "Garmin VO2 Max (CSV)",
+    "six-week": "6-Week Challenge (CSV)",
+    "macrofactor": "MacroFactor (CSV)",
+    "apple-resting-hr": "Apple Resting HR (XML)",
+}
+
+# File extensions each source accepts
+EXPECTED_EXTENSIONS = {
+    "garmin-activities": (".csv",),
+    "garmin-weight": (".csv",),
+    "garmin-vo2max": (".csv",),
+    "six-week": (".csv",),
+    "macrofactor": (".csv",),
+    "apple-resting-hr": (".xml",),
+}
+
+# Bytes read from an upload to detect its type; enough for any CSV header row
+DETECT_PEEK_BYTES = 4096
+
+# Distinctive CSV header keywords per source, checked in order; all must match
+CSV_HEADER_KEYWORDS = (
+    (("activity type", "aerobic te"), "garmin-activities"),
+    (("weight", "bmi", "body fat"), "garmin-weight"),
+    (("vo2",), "garmin-vo2max"),
+    (("vo 2",), "garmin-vo2max"),
+    (("goal", "set1"), "six-week"),
+    (("goal", "set 1"), "six-week"),
+    # 6-week uses semicolons
+    ((";", "goal"), "six-week"),
+    # MacroFactor CSV export
+    (("food name", "calories", "serving"), "macrofactor"),
+)
+
+# The table above as one regex: a group per entry, made of a lookahead per
+# keyword so keyword order doesn't matter. The first matching group wins.
+CSV_HEADER_RE = re.compile("|".join(
+    f"(?P<source{i}>" + "".join(f"(?=.*?{re.escape(keyword)})" for keyword in keywords) + ")"
+    for i, (keywords, _) in enumerate(CSV_HEADER_KEYWORDS)
+))
+
+# Importer (module, class) per source, imported only when that source runs
+IMPORTERS = {
+    "garmin-activities": ("health_import.importers.garmin_activities", "GarminActivitiesImporter"),
+    "garmin-weight": ("health_import.importers.garmin_weight", "GarminWeightImporter"),
+    "garmin-vo2max": ("health_import.importers.garmin_vo2max", "GarminVO2MaxImporter"),
+    "six-week": ("health_import.importers.six_week", "SixWeekImporter"),
+    "macrofactor": ("health_import.importers.macrofactor", "MacroFactorImporter"),
+    "apple-resting-hr": ("health_import.importers.apple_resting_hr", "AppleRestingHRImporter"),
+}
 
 
 def detect_source_type(filename: str, content: bytes) -> str:
-    """Auto-detect source type from filename and content"""
+    """Auto-detect source type from filename and the start of the file content"""
     filename_lower = filename.lower()
 
     # Check file extension first
@@ -21,28 +77,13 @@ def detect_source_type(filename: str, content: bytes) -> str:
 
     # For CSV files, inspect headers
     if filename_lower.endswith('.csv'):
-        try:
-            # Decode and get first line
-            text = content.decode('utf-8')
-            first_line = text.split('\n')[0].lower()
-
-            # Check for distinctive headers
-            if 'activity type' in first_line and 'aerobic te' in first_line:
-                return "garmin-activities"
-            if 'weight' in first_line and 'bmi' in first_line and 'body fat' in first_line:
-                return "garmin-weight"
-            if 'vo2' in first_line or 'vo 2' in first_line:
-                return "garmin-vo2max"
-            if 'goal' in first_line and ('set1' in first_line or 'set 1' in first_line):
-                return "six-week"
-            # Check for semicolon delimiter (6-week uses semicolons)
-            if ';' in first_line and 'goal' in first_line:
-                return "six-week"
-            # MacroFactor CSV export
-            if 'food name' in first_line and 'calories' in first_line and 'serving' in first_line:
-                return "macrofactor"
-        except:
-            pass
+        # Only the header line is needed; slice before decoding
+        first_line = content[:DETECT_PEEK_BYTES].split(b'\n', 1)[0].decode('utf-8', errors='ignore').lower()
+
+        # Check for distinctive headers
+        match = CSV_HEADER_RE.match(first_line)
+        if match:
+            return CSV_HEADER_KEYWORDS[int(match.lastgroup.removeprefix("source"))][1]
 
     return None
 
@@ -79,15 +120,6 @@ def render_sidebar():
         st.sidebar.info("Select a database above to enable imports")
         return None
 
-    source_options = {
-        "garmin-activities": "Garmin Activities (CSV)",
-        "garmin-weight": "Garmin Weight (CSV)",
-        "garmin-vo2max": "Garmin VO2 Max (CSV)",
-        "six-week": "6-Week Challenge (CSV)",
-        "macrofactor": "MacroFactor (CSV)",
-        "apple-resting-hr": "Apple Resting HR (XML)",
-    }
-
     # File uploader - accept all supported types
     # Use counter key to allow clearing the uploader after import
     uploader_key = st.session_state.get("uploader_key", 0)
@@ -100,26 +132,28 @@ def render_sidebar():
     # Auto-detect or manual source selection
     detected_source = None
     if uploaded_file is not None:
-        detected_source = detect_source_type(uploaded_file.name, uploaded_file.getvalue())
+        head = uploaded_file.read(DETECT_PEEK_BYTES)
+        uploaded_file.seek(0)
+        detected_source = detect_source_type(uploaded_file.name, head)
 
         if detected_source:
-            st.sidebar.success(f"Detected: {source_options[detected_source]}")
+            st.sidebar.success(f"Detected: {SOURCE_OPTIONS[detected_source]}")
             selected_source = detected_source
 
             # Allow override
             if st.sidebar.checkbox("Override detected type", key="override_source"):
                 selected_source = st.sidebar.selectbox(
                     "Source Type",
-                    options=list(source_options.keys()),
-                    format_func=lambda x: source_options[x],
+                    options=list(SOURCE_OPTIONS.keys()),
+                    format_func=lambda x: SOURCE_OPTIONS[x],
                     key="import_source_override"
                 )
         else:
             st.sidebar.warning("Could not auto-detect source type")
             selected_source = st.sidebar.selectbox(
                 "Source Type",
-                options=list(source_options.keys()),
-                format_func=lambda x: source_options[x],
+                options=list(SOURCE_OPTIONS.keys()),
+                format_func=lambda x: SOURCE_OPTIONS[x],
                 key="import_source_manual"
             )
 
@@ -132,53 +166,32 @@ def render_sidebar():
 
 def run_import(db_choice: str, source: str, uploaded_file):
     """Run import with uploaded file"""
-    from health_import.core.database import Database
     from health_import.core.logging_setup import setup_logging
-    from health_import.importers.garmin_activities import GarminActivitiesImporter
-    from health_import.importers.garmin_weight import GarminWeightImporter
-    from health_import.importers.garmin_vo2max import GarminVO2MaxImporter
-    from health_import.importers.six_week import SixWeekImporter
-    from health_import.importers.macrofactor import MacroFactorImporter
-    from health_import.importers.apple_resting_hr import AppleRestingHRImporter
 
     # Setup logging with file output
     setup_logging(verbosity=1, log_to_file=True)
 
-    importers = {
-        "garmin-activities": GarminActivitiesImporter,
-        "garmin-weight": GarminWeightImporter,
-        "garmin-vo2max": GarminVO2MaxImporter,
-        "six-week": SixWeekImporter,
-        "macrofactor": MacroFactorImporter,
-        "apple-resting-hr": AppleRestingHRImporter,
-    }
-
     # Validate file extension matches source type
     filename = uploaded_file.name.lower()
-    expected_ext = {
-        "garmin-activities": [".csv"],
-        "garmin-weight": [".csv"],
-        "garmin-vo2max": [".csv"],
-        "six-week": [".csv"],
-        "macrofactor": [".csv"],
-        "apple-resting-hr": [".xml"],
-    }
-
-    if not any(filename.endswith(ext) for ext in expected_ext[source]):
-        st.sidebar.error(f"File type mismatch: {source} expects {'/'.join(expected_ext[source])} file")
+    if not filename.endswith(EXPECTED_EXTENSIONS[source]):
+        st.sidebar.error(f"File type mismatch: {source} expects {'/'.join(EXPECTED_EXTENSIONS[source])} file")
         return
 
     try:
+        from health_import.core.database import Database
+
         # Save uploaded file to temp location
         with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp:
-            tmp.write(uploaded_file.getvalue())
+            uploaded_file.seek(0)
+            shutil.copyfileobj(uploaded_file, tmp, 1024 * 1024)
             tmp_path = Path(tmp.name)
 
         # Run import
         db_path = DB_PATHS[db_choice]
         with Database(db_path) as db:
             db.init_schema()
-            importer_class = importers[source]
+            module_name, class_name = IMPORTERS[source]
+            importer_class = getattr(importlib.import_module(module_name), class_name)
             importer = importer_class(db, verbosity=1)
             result = importer.import_file(tmp_path)
 
@@ -194,6 +207,9 @@ def run_import(db_choice: str, source: str, uploaded_file):
         # Cleanup
         tmp_path.unlink()
 
+        # Imported rows invalidate cached dashboard queries
+        clear_query_cache()
+
         # Clear file uploader by incrementing key
         st.session_state["uploader_key"] = st.session_state.get("uploader_key", 0) + 1
         st.rerun()
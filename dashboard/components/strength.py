@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from dashboard.utils.queries import (
     get_strength_summary,
+    get_strength_category_totals,
     get_strength_progress,
     get_recent_workouts,
 )
@@ -51,7 +52,7 @@ def render_strength(conn):
 
     with col2:
         st.subheader("By Category")
-        category_df = summary_df.groupby("category")["workouts"].sum().reset_index()
+        category_df = get_strength_category_totals(conn)
         fig = px.pie(
             category_df,
             values="workouts",
@@ -4,10 +4,13 @@ import pandas as pd
 import altair as alt
 from datetime import date, timedelta
 
+from dashboard.utils.db import clear_query_cache, write_transaction
+from dashboard.utils.garmin import get_fetcher
+from dashboard.utils.paging import page_of
 from health_import.garmin.vo2max import (
-    GarminVO2MaxFetcher,
     import_vo2max_to_db,
     get_existing_vo2max,
+    get_stored_vo2max_dates,
 )
 
 
@@ -16,15 +19,12 @@ def render_vo2max(conn):
     st.header("VO2 Max")
 
     # Initialize session state
-    if 'garmin_fetcher' not in st.session_state:
-        st.session_state.garmin_fetcher = GarminVO2MaxFetcher()
     if 'vo2max_preview' not in st.session_state:
         st.session_state.vo2max_preview = None
 
-    fetcher = st.session_state.garmin_fetcher
-
-    # Check login status
-    logged_in = fetcher.is_logged_in()
+    # Check login status (fetcher and its session are shared across sessions)
+    fetcher = get_fetcher("vo2max")
+    logged_in = fetcher.client is not None
 
     # Login section
     if not logged_in:
@@ -58,10 +58,10 @@ def render_vo2max(conn):
         col3.metric("Date Range", f"{df.iloc[-1]['Date']} to {df.iloc[0]['Date']}")
 
         # Chart with tight Y axis
-        chart_df = df[df['Type'] == 'running'].copy()
+        chart_df = df[df['Type'] == 'running']
         if not chart_df.empty:
-            chart_df['Date'] = pd.to_datetime(chart_df['Date'])
-            chart_df = chart_df.sort_values('Date')
+            # Parsed here as naive dates; Altair reads bare date strings as UTC
+            chart_df = chart_df.assign(Date=pd.to_datetime(chart_df['Date'], format="ISO8601")).sort_values('Date')
 
             # Calculate Y axis range with padding
             vo2_min = chart_df['VO2 Max'].min()
@@ -70,7 +70,7 @@ def render_vo2max(conn):
             y_min = vo2_min - padding
             y_max = vo2_max + padding
 
-            chart = alt.Chart(chart_df).mark_line(point=True).encode(
+            chart = alt.Chart(chart_df).mark_line(point=True, clip=True).encode(
                 x=alt.X('Date:T', title='Date'),
                 y=alt.Y('VO2 Max:Q', title='VO2 Max (ml/kg/min)',
                         scale=alt.Scale(domain=[y_min, y_max])),
@@ -90,23 +90,23 @@ def render_vo2max(conn):
 
     if fetch_mode == "Days Back":
         days_back = st.slider("Days to fetch", 7, 365, 30)
-        start_date = None
-        end_date = None
+        end_date = date.today()
+        start_date = end_date - timedelta(days=days_back)
     else:
         col1, col2 = st.columns(2)
         with col1:
             start_date = st.date_input("Start Date", date.today() - timedelta(days=30))
         with col2:
             end_date = st.date_input("End Date", date.today())
-        days_back = None
 
     if st.button("Fetch VO2 Max Data", type="primary"):
         with st.spinner("Fetching from Garmin..."):
             try:
+                # Days already fully stored need no API call
                 readings = fetcher.fetch_vo2max(
-                    days_back=days_back,
                     start_date=start_date,
-                    end_date=end_date
+                    end_date=end_date,
+                    skip_dates=get_stored_vo2max_dates(conn, start_date, end_date)
                 )
                 st.session_state.vo2max_preview = readings
             except Exception as e:
@@ -122,7 +122,7 @@ def render_vo2max(conn):
         if readings:
             preview_df = pd.DataFrame(readings)
             preview_df.columns = ['Date', 'VO2 Max', 'Type']
-            st.dataframe(preview_df, hide_index=True, width="stretch")
+            st.dataframe(page_of(preview_df, key="vo2max_preview_page"), hide_index=True, width="stretch")
 
             # Import button
             col1, col2 = st.columns([1, 4])
@@ -138,7 +138,9 @@ def render_vo2max(conn):
                             return
                         source_id = source_row[0]
 
-                        result = import_vo2max_to_db(conn, readings, source_id)
+                        with write_transaction(conn):
+                            result = import_vo2max_to_db(conn, readings, source_id)
+                        clear_query_cache()
                         st.success(
                             f"Imported: {result['inserted']} new, "
                             f"{result['skipped']} already existed"
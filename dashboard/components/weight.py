@@ -1,62 +1,106 @@
 """Weight tab component - Garmin weight data"""
 import streamlit as st
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import pandas as pd
+from typing import Optional
 
+from dashboard.utils.db import cached_query, clear_query_cache, write_transaction
+from dashboard.utils.downsample import lttb
+from dashboard.utils.paging import page_of
 
-def get_weight_data(conn, include_hidden: bool = False) -> pd.DataFrame:
-    """Get weight data, optionally including hidden records"""
-    if include_hidden:
-        query = """
-        SELECT id, measurement_date as date, measurement_time as time,
-               weight_lbs, weight_change_lbs, bmi,
-               body_fat_pct, muscle_mass_lbs, bone_mass_lbs, body_water_pct,
-               COALESCE(hidden, 0) as hidden
-        FROM body_measurements
-        ORDER BY measurement_date, measurement_time
-        """
-    else:
-        query = """
-        SELECT id, measurement_date as date, measurement_time as time,
-               weight_lbs, weight_change_lbs, bmi,
-               body_fat_pct, muscle_mass_lbs, bone_mass_lbs, body_water_pct,
-               0 as hidden
-        FROM body_measurements
-        WHERE hidden = 0 OR hidden IS NULL
-        ORDER BY measurement_date, measurement_time
-        """
-    return pd.read_sql_query(query, conn)
+# Longer visible histories are downsampled to CHART_POINTS for the chart
+DOWNSAMPLE_ABOVE = 1500
+CHART_POINTS = 800
+
+
+@cached_query
+def get_weight_data(conn, hidden: bool = False) -> pd.DataFrame:
+    """Get visible or hidden weight records"""
+    where_clause = "hidden = 1" if hidden else "hidden = 0 OR hidden IS NULL"
+    query = f"""
+    SELECT id, measurement_date as date, measurement_time as time,
+           weight_lbs, weight_change_lbs, bmi,
+           body_fat_pct, muscle_mass_lbs, bone_mass_lbs, body_water_pct
+    FROM body_measurements
+    WHERE {where_clause}
+    ORDER BY measurement_date, measurement_time
+    """
+    return pd.read_sql_query(query, conn, parse_dates=["date"])
+
+
+@cached_query
+def get_weight_chart_points(conn) -> pd.DataFrame:
+    """Get visible weights to plot, downsampled with LTTB for long histories"""
+    df = get_weight_data(conn)[["date", "weight_lbs"]]
+    if len(df) <= DOWNSAMPLE_ABOVE:
+        return df
 
+    df = df.dropna()
+    days = df["date"].to_numpy().astype("datetime64[D]").astype(float)
+    return df.iloc[lttb(days, df["weight_lbs"].to_numpy(), CHART_POINTS)]
 
+
+@cached_query
 def get_weight_stats(conn) -> dict:
     """Get weight statistics (excluding hidden records)"""
+    # Visible-record aggregates and the hidden count in one pass
     query = """
     SELECT
-        COUNT(*) as count,
-        MIN(measurement_date) as earliest,
-        MAX(measurement_date) as latest,
-        AVG(weight_lbs) as avg_weight,
-        MIN(weight_lbs) as min_weight,
-        MAX(weight_lbs) as max_weight
+        COUNT(CASE WHEN COALESCE(hidden, 0) = 0 THEN 1 END) as count,
+        COUNT(CASE WHEN hidden = 1 THEN 1 END) as hidden_count,
+        MIN(CASE WHEN COALESCE(hidden, 0) = 0 THEN measurement_date END) as earliest,
+        MAX(CASE WHEN COALESCE(hidden, 0) = 0 THEN measurement_date END) as latest,
+        AVG(CASE WHEN COALESCE(hidden, 0) = 0 THEN weight_lbs END) as avg_weight,
+        MIN(CASE WHEN COALESCE(hidden, 0) = 0 THEN weight_lbs END) as min_weight,
+        MAX(CASE WHEN COALESCE(hidden, 0) = 0 THEN weight_lbs END) as max_weight
+    FROM body_measurements
+    """
+    return dict(conn.execute(query).fetchone())
+
+
+@cached_query
+def get_weight_edges(conn) -> Optional[tuple]:
+    """Get the first and latest visible weight records as dicts"""
+    query = """
+    SELECT weight_lbs, body_fat_pct
     FROM body_measurements
     WHERE hidden = 0 OR hidden IS NULL
+    ORDER BY measurement_date {order}, measurement_time {order}
+    LIMIT 1
     """
-    row = conn.execute(query).fetchone()
+    first = conn.execute(query.format(order="ASC")).fetchone()
+    if first is None:
+        return None
+    latest = conn.execute(query.format(order="DESC")).fetchone()
+    return dict(first), dict(latest)
 
-    # Count hidden records
-    hidden_count = conn.execute(
-        "SELECT COUNT(*) FROM body_measurements WHERE hidden = 1"
-    ).fetchone()[0]
 
-    return {
-        "count": row[0] or 0,
-        "hidden_count": hidden_count or 0,
-        "earliest": row[1],
-        "latest": row[2],
-        "avg_weight": row[3],
-        "min_weight": row[4],
-        "max_weight": row[5],
-    }
+@cached_query
+def get_weight_trend_fit(conn) -> Optional[tuple]:
+    """Get the least-squares (slope, intercept) of visible weights against
+    record position, from sums aggregated in SQL"""
+    query = """
+    SELECT COUNT(weight_lbs) as n,
+           SUM(x) as sx,
+           SUM(weight_lbs) as sy,
+           SUM(x * weight_lbs) as sxy,
+           SUM(x * x) as sxx
+    FROM (
+        SELECT weight_lbs,
+               ROW_NUMBER() OVER (ORDER BY measurement_date, measurement_time) - 1 as x
+        FROM body_measurements
+        WHERE hidden = 0 OR hidden IS NULL
+    )
+    WHERE weight_lbs IS NOT NULL
+    """
+    n, sx, sy, sxy, sxx = conn.execute(query).fetchone()
+    denominator = n * sxx - sx * sx if n > 2 else 0
+    if not denominator:
+        return None
+
+    slope = (n * sxy - sx * sy) / denominator
+    return slope, (sy - slope * sx) / n
 
 
 def render_weight(conn):
@@ -64,6 +108,11 @@ def render_weight(conn):
     col_header, col_reload = st.columns([6, 1])
     col_header.header("Weight Data")
     if col_reload.button("Reload", key="weight_reload"):
+        get_weight_data.clear()
+        get_weight_stats.clear()
+        get_weight_edges.clear()
+        get_weight_trend_fit.clear()
+        get_weight_chart_points.clear()
         st.rerun()
 
     if conn is None:
@@ -87,39 +136,36 @@ def render_weight(conn):
 
     st.divider()
 
-    # Get all data including hidden
-    df = get_weight_data(conn, include_hidden=True)
-
-    if df.empty:
-        return
-
-    # Split into visible and hidden
-    df_visible = df[df["hidden"] == 0]
-    df_hidden = df[df["hidden"] == 1]
-
-    # Latest stats (from visible only)
-    if not df_visible.empty:
-        latest = df_visible.iloc[-1]
-        first = df_visible.iloc[0]
-        total_change = latest["weight_lbs"] - first["weight_lbs"]
+    # Latest stats (from visible only), without loading every record
+    edges = get_weight_edges(conn)
+    if edges is not None:
+        first, latest = edges
+        has_change = latest["weight_lbs"] is not None and first["weight_lbs"] is not None
 
         col1, col2, col3, col4 = st.columns(4)
-        col1.metric("Current Weight", f"{latest['weight_lbs']:.1f} lbs")
-        col2.metric("Starting Weight", f"{first['weight_lbs']:.1f} lbs")
-        col3.metric("Total Change", f"{total_change:+.1f} lbs")
-        col4.metric("Body Fat", f"{latest['body_fat_pct']:.1f}%" if pd.notna(latest['body_fat_pct']) else "N/A")
+        col1.metric("Current Weight", f"{latest['weight_lbs']:.1f} lbs" if latest["weight_lbs"] is not None else "N/A")
+        col2.metric("Starting Weight", f"{first['weight_lbs']:.1f} lbs" if first["weight_lbs"] is not None else "N/A")
+        col3.metric("Total Change", f"{latest['weight_lbs'] - first['weight_lbs']:+.1f} lbs" if has_change else "N/A")
+        col4.metric("Body Fat", f"{latest['body_fat_pct']:.1f}%" if latest["body_fat_pct"] is not None else "N/A")
 
         st.divider()
 
+    # Visible records, plus hidden ones only when there are any
+    df_visible = get_weight_data(conn)
+    df_hidden = get_weight_data(conn, hidden=True) if stats["hidden_count"] else None
+    # Dates are parsed on load; show them without a time in tables
+    date_column = st.column_config.DateColumn("Date")
+
     # Weight chart
     st.subheader("Weight Over Time")
     fig = go.Figure()
 
     # Visible records (solid blue line)
     if not df_visible.empty:
-        fig.add_trace(go.Scatter(
-            x=df_visible["date"],
-            y=df_visible["weight_lbs"],
+        chart_df = get_weight_chart_points(conn)
+        fig.add_trace(go.Scattergl(
+            x=chart_df["date"],
+            y=chart_df["weight_lbs"],
             name="Visible",
             mode="lines+markers",
             line=dict(color="blue", width=1.5),
@@ -127,22 +173,21 @@ def render_weight(conn):
         ))
 
         # Add trend line
-        if len(df_visible) > 2:
+        fit = get_weight_trend_fit(conn)
+        if fit is not None:
             import numpy as np
-            x_num = np.arange(len(df_visible))
-            z = np.polyfit(x_num, df_visible["weight_lbs"].fillna(method='ffill'), 1)
-            p = np.poly1d(z)
+            slope, intercept = fit
             fig.add_trace(go.Scatter(
                 x=df_visible["date"],
-                y=p(x_num),
+                y=intercept + slope * np.arange(len(df_visible)),
                 name="Trend",
                 mode="lines",
                 line=dict(dash="dash", color="red")
             ))
 
     # Hidden records (gray markers)
-    if not df_hidden.empty:
-        fig.add_trace(go.Scatter(
+    if df_hidden is not None:
+        fig.add_trace(go.Scattergl(
             x=df_hidden["date"],
             y=df_hidden["weight_lbs"],
             name="Hidden",
@@ -163,32 +208,29 @@ def render_weight(conn):
     # Body composition (visible only)
     if not df_visible.empty:
         st.subheader("Body Composition")
-        col1, col2 = st.columns(2)
-
-        with col1:
-            if df_visible["body_fat_pct"].notna().any():
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=df_visible["date"],
-                    y=df_visible["body_fat_pct"],
-                    name="Body Fat %",
-                    mode="lines+markers"
-                ))
-                fig.update_layout(height=300, yaxis_title="Body Fat %")
-                st.plotly_chart(fig, width="stretch")
 
-        with col2:
-            if df_visible["muscle_mass_lbs"].notna().any():
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
+        # Side-by-side panels for the measurements that have data, as one figure
+        panels = [
+            (column, name, axis_title, color)
+            for column, name, axis_title, color in [
+                ("body_fat_pct", "Body Fat %", "Body Fat %", None),
+                ("muscle_mass_lbs", "Muscle Mass", "Muscle Mass (lbs)", "green"),
+            ]
+            if df_visible[column].notna().any()
+        ]
+        if panels:
+            fig = make_subplots(rows=1, cols=len(panels))
+            for i, (column, name, axis_title, color) in enumerate(panels, start=1):
+                fig.add_trace(go.Scattergl(
                     x=df_visible["date"],
-                    y=df_visible["muscle_mass_lbs"],
-                    name="Muscle Mass",
+                    y=df_visible[column],
+                    name=name,
                     mode="lines+markers",
-                    line=dict(color="green")
-                ))
-                fig.update_layout(height=300, yaxis_title="Muscle Mass (lbs)")
-                st.plotly_chart(fig, width="stretch")
+                    line=dict(color=color)
+                ), row=1, col=i)
+                fig.update_yaxes(title_text=axis_title, row=1, col=i)
+            fig.update_layout(height=300, showlegend=False)
+            st.plotly_chart(fig, width="stretch")
 
         st.divider()
 
@@ -214,33 +256,35 @@ def render_weight(conn):
                 key="weight_hide_above"
             )
 
-        # Preview what would be hidden
-        preview_hidden = df_visible.copy()
-        if hide_below > 0:
-            preview_hidden = preview_hidden[preview_hidden["weight_lbs"] < hide_below]
-        if hide_above > 0:
-            above_mask = df_visible["weight_lbs"] > hide_above
-            if hide_below > 0:
-                preview_hidden = pd.concat([preview_hidden, df_visible[above_mask]])
-            else:
-                preview_hidden = df_visible[above_mask]
+        # Preview what would be hidden (same condition as the UPDATE below)
+        weights = df_visible["weight_lbs"].to_numpy()
+        preview_hidden = df_visible[
+            ((hide_below > 0) & (weights < hide_below)) | ((hide_above > 0) & (weights > hide_above))
+        ]
 
         if len(preview_hidden) > 0:
             st.warning(f"Would hide {len(preview_hidden)} records")
             st.dataframe(
-                preview_hidden[["date", "weight_lbs"]].rename(columns={"date": "Date", "weight_lbs": "Weight (lbs)"}),
+                page_of(preview_hidden, key="weight_hide_page"),
                 hide_index=True,
-                width="stretch"
+                width="stretch",
+                column_order=["date", "weight_lbs"],
+                column_config={"date": date_column, "weight_lbs": "Weight (lbs)"},
             )
 
             if st.button("Hide These Records", type="primary", key="weight_hide_btn"):
-                ids = preview_hidden["id"].tolist()
-                conn.executemany(
-                    "UPDATE body_measurements SET hidden = 1 WHERE id = ?",
-                    [(id,) for id in ids]
-                )
-                conn.commit()
-                st.success(f"Hidden {len(ids)} records")
+                # One statement over the thresholds rather than one per id
+                with write_transaction(conn):
+                    cursor = conn.execute(
+                        """
+                        UPDATE body_measurements SET hidden = 1
+                        WHERE COALESCE(hidden, 0) = 0
+                          AND ((? > 0 AND weight_lbs < ?) OR (? > 0 AND weight_lbs > ?))
+                        """,
+                        (hide_below, hide_below, hide_above, hide_above)
+                    )
+                clear_query_cache()
+                st.success(f"Hidden {cursor.rowcount} records")
                 st.rerun()
         else:
             st.info("No records match the threshold criteria")
@@ -248,19 +292,29 @@ def render_weight(conn):
     # Recent records table (visible only)
     st.subheader("Recent Records")
     if not df_visible.empty:
-        recent_df = df_visible.tail(30).iloc[::-1][["date", "weight_lbs", "bmi", "body_fat_pct"]].copy()
-        recent_df.columns = ["Date", "Weight (lbs)", "BMI", "Body Fat %"]
-        st.dataframe(recent_df, width="stretch", hide_index=True)
+        # Last 30 rows, newest first, as one slice of the frame
+        st.dataframe(
+            df_visible.iloc[:-31:-1],
+            width="stretch",
+            hide_index=True,
+            column_order=["date", "weight_lbs", "bmi", "body_fat_pct"],
+            column_config={"date": date_column, "weight_lbs": "Weight (lbs)", "bmi": "BMI", "body_fat_pct": "Body Fat %"},
+        )
 
     # Hidden records table (if any)
-    if not df_hidden.empty:
+    if df_hidden is not None:
         with st.expander(f"Hidden Records ({len(df_hidden)})"):
-            hidden_display = df_hidden.iloc[::-1][["id", "date", "weight_lbs"]].copy()
-            hidden_display.columns = ["ID", "Date", "Weight (lbs)"]
-            st.dataframe(hidden_display, width="stretch", hide_index=True)
+            st.dataframe(
+                page_of(df_hidden.iloc[::-1], key="weight_hidden_page"),
+                width="stretch",
+                hide_index=True,
+                column_order=["id", "date", "weight_lbs"],
+                column_config={"id": "ID", "date": date_column, "weight_lbs": "Weight (lbs)"},
+            )
 
             if st.button("Unhide All Records", key="weight_unhide_btn"):
-                conn.execute("UPDATE body_measurements SET hidden = 0 WHERE hidden = 1")
-                conn.commit()
+                with write_transaction(conn):
+                    conn.execute("UPDATE body_measurements SET hidden = 0 WHERE hidden = 1")
+                clear_query_cache()
                 st.success("Unhid all records")
                 st.rerun()
@@ -1,17 +1,56 @@
 """Database connection utilities for dashboard"""
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
 import streamlit as st
 
+from health_import.core.rollups import ensure_rollups
+
 DB_PATHS = {
     "prod": Path("data/prod/health_data.db"),
     "test": Path("data/test/health_data.db"),
 }
 
+# Seconds before cached query results are refetched
+CACHE_TTL = 300
+
+# Serializes writes to the shared connections across sessions and workers
+_write_lock = threading.RLock()
+
+
+@st.cache_resource(show_spinner=False)
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    """Open a connection shared by every session and rerun"""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+
+    # WAL lets readers proceed while an import is writing
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Dashboard imports write too; enforce references like the CLI does
+    conn.execute("PRAGMA foreign_keys=ON")
+
+    # Build rollup tables for databases that predate them, once per server
+    # rather than from the read helpers
+    try:
+        with write_transaction(conn):
+            ensure_rollups(conn)
+    except sqlite3.OperationalError:
+        # Schema not initialized yet
+        pass
+    return conn
+
 
 def get_connection(db_key: str = "prod") -> sqlite3.Connection:
-    """Get database connection for specified environment"""
+    """Get database connection for specified environment.
+
+    The connection is opened once per database and kept for the life of the
+    server, so callers must not close it.
+    """
     if db_key is None:
         return None
 
@@ -20,31 +59,61 @@ def get_connection(db_key: str = "prod") -> sqlite3.Connection:
     if not db_path.exists():
         return None
 
-    conn = sqlite3.connect(db_path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
+    conn = _open_connection(str(db_path))
 
     # Check if schema is initialized
     try:
         conn.execute("SELECT 1 FROM data_sources LIMIT 1")
     except sqlite3.OperationalError:
         # Schema not initialized
-        conn.close()
         return None
 
     return conn
 
 
-def init_db_if_needed(db_key: str = "prod") -> bool:
-    """Initialize database schema if needed"""
-    db_path = DB_PATHS.get(db_key, DB_PATHS["prod"])
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+@contextmanager
+def write_transaction(conn: sqlite3.Connection):
+    """Run a block of writes on the shared connection as one transaction.
+
+    Commits when the block finishes and rolls back if it raises, so a failed
+    write never leaves rows pending for the next session's commit.
+    """
+    with _write_lock:
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def connection_path(conn: sqlite3.Connection) -> str:
+    """Get the database file path backing a connection"""
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def _connection_version(conn: sqlite3.Connection) -> tuple:
+    """Key a connection by its file and the file's committed version"""
+    # data_version changes when any other connection (CLI import, MCP
+    # server, dashboard importer) commits to the file
+    return connection_path(conn), conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def cached_query(func):
+    """Cache a read-only query helper across reruns.
+
+    Connections aren't hashable, so results are keyed by the database file
+    path and its data_version instead; commits from other connections start
+    a fresh cache entry. Call clear_query_cache() after writing through the
+    shared connection itself.
+    """
+    return st.cache_data(
+        ttl=CACHE_TTL,
+        show_spinner=False,
+        hash_funcs={sqlite3.Connection: _connection_version},
+    )(func)
 
-    schema_path = Path("schema/init.sql")
-    if not schema_path.exists():
-        return False
 
-    conn = sqlite3.connect(db_path)
-    conn.executescript(schema_path.read_text())
-    conn.commit()
-    conn.close()
-    return True
+def clear_query_cache() -> None:
+    """Drop all cached query results so the next rerun reads fresh data"""
+    st.cache_data.clear()
@@ -0,0 +1,34 @@
+"""Shared Garmin Connect fetchers for dashboard"""
+import streamlit as st
+
+from health_import.garmin import GarminActivityFetcher, GarminVO2MaxFetcher, GarminWeightFetcher
+
+FETCHERS = {
+    "activities": GarminActivityFetcher,
+    "vo2max": GarminVO2MaxFetcher,
+    "weight": GarminWeightFetcher,
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _shared_fetcher(kind: str):
+    """Create the fetcher kept for the life of the server"""
+    return FETCHERS[kind]()
+
+
+def get_fetcher(kind: str):
+    """Get the shared fetcher for a Garmin data type.
+
+    The saved session is loaded once and reused across reruns and imports.
+    Until that succeeds, each call retries it, so a login made elsewhere
+    is picked up. Check fetcher.client to see whether it is logged in.
+    """
+    fetcher = _shared_fetcher(kind)
+    if fetcher.client is None:
+        fetcher.is_logged_in()
+    return fetcher
+
+
+def reset_fetchers() -> None:
+    """Drop the shared fetchers so the next call reloads the saved session"""
+    _shared_fetcher.clear()
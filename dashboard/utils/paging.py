@@ -0,0 +1,22 @@
+"""Paging for long dashboard tables"""
+import pandas as pd
+import streamlit as st
+
+# Rows sent to the browser per page of a long table
+PAGE_SIZE = 50
+
+
+def page_of(df: pd.DataFrame, key: str, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+    """Return the rows of df on the page picked by a "Page" input.
+
+    Short frames come back whole with no input drawn; key must be unique
+    per table.
+    """
+    if len(df) <= page_size:
+        return df
+
+    pages = (len(df) + page_size - 1) // page_size
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=key)
+    start = (int(page) - 1) * page_size
+    st.caption(f"Rows {start + 1}-{min(start + page_size, len(df))} of {len(df)}")
+    return df.iloc[start:start + page_size]
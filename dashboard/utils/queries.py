@@ -3,21 +3,27 @@ import sqlite3
 import pandas as pd
 from typing import Optional
 
+from .db import cached_query
 
+
+@cached_query
 def get_source_metrics(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get metrics per data source"""
     query = """
     SELECT ds.name as source,
            ds.description,
-           (SELECT MAX(import_timestamp) FROM import_log WHERE source_id = ds.id AND status='completed') as last_import,
-           (SELECT COUNT(*) FROM import_log WHERE source_id = ds.id AND status='completed') as import_count,
-           (SELECT SUM(records_inserted) FROM import_log WHERE source_id = ds.id AND status='completed') as total_records
+           MAX(l.import_timestamp) as last_import,
+           COUNT(l.id) as import_count,
+           SUM(l.records_inserted) as total_records
     FROM data_sources ds
+    LEFT JOIN import_log l ON l.source_id = ds.id AND l.status = 'completed'
+    GROUP BY ds.id
     ORDER BY ds.name
     """
     return pd.read_sql_query(query, conn)
 
 
+@cached_query
 def get_table_stats(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get record counts and date ranges for main tables"""
     tables = [
@@ -29,26 +35,21 @@ def get_table_stats(conn: sqlite3.Connection) -> pd.DataFrame:
         ("nutrition_entries", "date", "Nutrition Entries"),
     ]
 
-    results = []
-    for table, date_col, label in tables:
-        try:
-            query = f"""
-            SELECT '{label}' as category,
-                   COUNT(*) as records,
-                   MIN({date_col}) as earliest,
-                   MAX({date_col}) as latest
-            FROM {table}
-            """
-            df = pd.read_sql_query(query, conn)
-            results.append(df)
-        except Exception:
-            pass
-
-    if results:
-        return pd.concat(results, ignore_index=True)
-    return pd.DataFrame()
+    # Skip tables missing from databases built by older schemas
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    tables = [t for t in tables if t[0] in existing]
+    if not tables:
+        return pd.DataFrame()
+
+    # One round trip for every table
+    query = " UNION ALL ".join(
+        f"SELECT ? as category, COUNT(*) as records, MIN({date_col}) as earliest, MAX({date_col}) as latest FROM {table}"
+        for table, date_col, _ in tables
+    )
+    return pd.read_sql_query(query, conn, params=[label for _, _, label in tables])
 
 
+@cached_query
 def get_recent_imports(conn: sqlite3.Connection, limit: int = 10) -> pd.DataFrame:
     """Get recent import log entries"""
     query = """
@@ -63,6 +64,7 @@ def get_recent_imports(conn: sqlite3.Connection, limit: int = 10) -> pd.DataFram
     return pd.read_sql_query(query, conn, params=(limit,))
 
 
+@cached_query
 def get_conflict_summary(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get conflict summary by table"""
     query = """
@@ -76,23 +78,13 @@ def get_conflict_summary(conn: sqlite3.Connection) -> pd.DataFrame:
 
 
 # Activities queries
+@cached_query
 def get_activities_summary(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get activities summary by type"""
-    query = """
-    SELECT COALESCE(t.name, 'Unknown') as activity_type,
-           COUNT(*) as count,
-           ROUND(SUM(a.distance_miles), 1) as total_miles,
-           ROUND(SUM(a.calories_total), 0) as total_calories,
-           ROUND(AVG(a.avg_hr), 0) as avg_hr,
-           ROUND(AVG(a.duration_seconds)/60, 1) as avg_duration_min
-    FROM activities a
-    LEFT JOIN activity_types t ON a.activity_type_id = t.id
-    GROUP BY t.name
-    ORDER BY count DESC
-    """
-    return pd.read_sql_query(query, conn)
+    return pd.read_sql_query("SELECT * FROM activities_summary_cache ORDER BY count DESC", conn)
 
 
+@cached_query
 def get_activities_date_range(conn: sqlite3.Connection) -> dict:
     """Get earliest and latest activity dates"""
     query = """
@@ -100,24 +92,16 @@ def get_activities_date_range(conn: sqlite3.Connection) -> dict:
            MAX(date(start_time)) as latest
     FROM activities
     """
-    row = conn.execute(query).fetchone()
-    return {"earliest": row[0], "latest": row[1]} if row else {"earliest": None, "latest": None}
+    return dict(conn.execute(query).fetchone())
 
 
+@cached_query
 def get_weekly_activities(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get weekly activity volume"""
-    query = """
-    SELECT strftime('%Y-%W', start_time) as week,
-           COUNT(*) as activities,
-           ROUND(SUM(distance_miles), 1) as miles,
-           ROUND(SUM(calories_total), 0) as calories
-    FROM activities
-    GROUP BY week
-    ORDER BY week
-    """
-    return pd.read_sql_query(query, conn)
+    return pd.read_sql_query("SELECT * FROM weekly_activities_cache ORDER BY week", conn)
 
 
+@cached_query
 def get_recent_activities(conn: sqlite3.Connection, limit: int = 20) -> pd.DataFrame:
     """Get recent activities"""
     query = """
@@ -133,16 +117,34 @@ def get_recent_activities(conn: sqlite3.Connection, limit: int = 20) -> pd.DataF
 
 
 # Body measurements queries
-def get_weight_trend(conn: sqlite3.Connection, days: int = 90) -> pd.DataFrame:
-    """Get weight trend over time"""
-    query = f"""
+
+# Trend queries always fetch at least this many days and filter shorter
+# ranges in memory, so switching the dashboard time range doesn't requery
+TREND_WINDOW_DAYS = 365
+
+
+def _since(df: pd.DataFrame, days: int) -> pd.DataFrame:
+    """Rows of a trend frame dated within the last N days (UTC, like SQLite's date('now'))"""
+    cutoff = pd.Timestamp.utcnow().tz_localize(None).normalize() - pd.Timedelta(days=days)
+    return df[df["date"] >= cutoff]
+
+
+@cached_query
+def _weight_history(conn: sqlite3.Connection, window_days: int) -> pd.DataFrame:
+    """Get weight measurements for the trend window"""
+    query = """
     SELECT measurement_date as date, weight_lbs, body_fat_pct,
            muscle_mass_lbs, body_water_pct
     FROM body_measurements
-    WHERE measurement_date >= date('now', '-{days} days')
+    WHERE measurement_date >= date('now', ?)
     ORDER BY measurement_date
     """
-    return pd.read_sql_query(query, conn)
+    return pd.read_sql_query(query, conn, params=(f"-{window_days} days",), parse_dates=["date"])
+
+
+def get_weight_trend(conn: sqlite3.Connection, days: int = 90) -> pd.DataFrame:
+    """Get weight trend over time"""
+    return _since(_weight_history(conn, max(days, TREND_WINDOW_DAYS)), days)
 
 
 def get_latest_weight(conn: sqlite3.Connection) -> Optional[dict]:
@@ -153,12 +155,11 @@ def get_latest_weight(conn: sqlite3.Connection) -> Optional[dict]:
     ORDER BY measurement_date DESC
     LIMIT 1
     """
-    df = pd.read_sql_query(query, conn)
-    if len(df) > 0:
-        return df.iloc[0].to_dict()
-    return None
+    row = conn.execute(query).fetchone()
+    return dict(row) if row else None
 
 
+@cached_query
 def get_vo2max_trend(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get VO2 Max over time"""
     query = """
@@ -169,18 +170,25 @@ def get_vo2max_trend(conn: sqlite3.Connection) -> pd.DataFrame:
     return pd.read_sql_query(query, conn)
 
 
-def get_resting_hr_trend(conn: sqlite3.Connection, days: int = 90) -> pd.DataFrame:
-    """Get resting heart rate trend"""
-    query = f"""
+@cached_query
+def _resting_hr_history(conn: sqlite3.Connection, window_days: int) -> pd.DataFrame:
+    """Get resting heart rate readings for the trend window"""
+    query = """
     SELECT measurement_date as date, resting_hr
     FROM resting_heart_rate
-    WHERE measurement_date >= date('now', '-{days} days')
+    WHERE measurement_date >= date('now', ?)
     ORDER BY measurement_date
     """
-    return pd.read_sql_query(query, conn)
+    return pd.read_sql_query(query, conn, params=(f"-{window_days} days",), parse_dates=["date"])
+
+
+def get_resting_hr_trend(conn: sqlite3.Connection, days: int = 90) -> pd.DataFrame:
+    """Get resting heart rate trend"""
+    return _since(_resting_hr_history(conn, max(days, TREND_WINDOW_DAYS)), days)
 
 
 # Strength queries
+@cached_query
 def get_strength_summary(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get strength training summary by exercise"""
     query = """
@@ -196,23 +204,37 @@ def get_strength_summary(conn: sqlite3.Connection) -> pd.DataFrame:
     return pd.read_sql_query(query, conn)
 
 
+@cached_query
+def get_strength_category_totals(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get strength workout counts per exercise category"""
+    query = """
+    SELECT e.category, COUNT(*) as workouts
+    FROM strength_workouts w
+    JOIN strength_exercises e ON w.exercise_id = e.id
+    WHERE e.category IS NOT NULL
+    GROUP BY e.category
+    ORDER BY e.category
+    """
+    return pd.read_sql_query(query, conn)
+
+
+@cached_query
 def get_strength_progress(conn: sqlite3.Connection, exercise_name: Optional[str] = None) -> pd.DataFrame:
     """Get strength progress over time"""
-    where_clause = ""
-    if exercise_name:
-        where_clause = f"WHERE e.display_name = '{exercise_name}'"
-
-    query = f"""
+    # One statement serves both the filtered and unfiltered case
+    query = """
     SELECT w.workout_date as date, e.display_name as exercise,
            w.total_value, w.goal_value
     FROM strength_workouts w
     JOIN strength_exercises e ON w.exercise_id = e.id
-    {where_clause}
+    WHERE (? IS NULL OR e.display_name = ?)
     ORDER BY w.workout_date
     """
-    return pd.read_sql_query(query, conn)
+    exercise_name = exercise_name or None
+    return pd.read_sql_query(query, conn, params=(exercise_name, exercise_name))
 
 
+@cached_query
 def get_recent_workouts(conn: sqlite3.Connection, limit: int = 20) -> pd.DataFrame:
     """Get recent strength workouts"""
     query = """
@@ -227,104 +249,80 @@ def get_recent_workouts(conn: sqlite3.Connection, limit: int = 20) -> pd.DataFra
 
 
 # Nutrition queries (aggregated from nutrition_entries)
+NUTRITION_DECIMALS = {"calories": 0, "protein_g": 1, "fat_g": 1, "carbs_g": 1, "fiber_g": 1}
+
+
+@cached_query
+def _daily_nutrition(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Get daily nutrition totals from food entries; the nutrition views
+    below are all derived from this one query"""
+    return pd.read_sql_query(
+        "SELECT * FROM daily_nutrition_cache ORDER BY date", conn, parse_dates=["date"]
+    )
+
+
 def get_nutrition_summary(conn: sqlite3.Connection, days: int = 30) -> pd.DataFrame:
     """Get nutrition daily summary aggregated from food entries"""
-    query = f"""
-    SELECT date,
-           ROUND(SUM(calories_kcal), 0) as calories,
-           ROUND(SUM(protein_g), 1) as protein_g,
-           ROUND(SUM(fat_g), 1) as fat_g,
-           ROUND(SUM(carbs_g), 1) as carbs_g,
-           ROUND(SUM(fiber_g), 1) as fiber_g
-    FROM nutrition_entries
-    WHERE date >= date('now', '-{days} days')
-    GROUP BY date
-    ORDER BY date
-    """
-    return pd.read_sql_query(query, conn)
+    return _since(_daily_nutrition(conn), days).round(NUTRITION_DECIMALS)
 
 
 def get_nutrition_averages(conn: sqlite3.Connection, days: int = 30) -> Optional[dict]:
     """Get average nutrition metrics from food entries"""
-    query = f"""
-    SELECT ROUND(AVG(daily_cal), 0) as avg_calories,
-           ROUND(AVG(daily_protein), 1) as avg_protein,
-           ROUND(AVG(daily_fat), 1) as avg_fat,
-           ROUND(AVG(daily_carbs), 1) as avg_carbs,
-           ROUND(AVG(daily_fiber), 1) as avg_fiber
-    FROM (
-        SELECT date,
-               SUM(calories_kcal) as daily_cal,
-               SUM(protein_g) as daily_protein,
-               SUM(fat_g) as daily_fat,
-               SUM(carbs_g) as daily_carbs,
-               SUM(fiber_g) as daily_fiber
-        FROM nutrition_entries
-        WHERE date >= date('now', '-{days} days')
-        GROUP BY date
-    )
-    """
-    df = pd.read_sql_query(query, conn)
-    if len(df) > 0:
-        return df.iloc[0].to_dict()
-    return None
+    means = _since(_daily_nutrition(conn), days).drop(columns="date").mean()
+    return {
+        "avg_" + column.removesuffix("_g"): None if pd.isna(means[column]) else round(float(means[column]), decimals)
+        for column, decimals in NUTRITION_DECIMALS.items()
+    }
 
 
 def get_weekly_nutrition(conn: sqlite3.Connection) -> pd.DataFrame:
     """Get weekly nutrition averages from food entries"""
-    query = """
-    SELECT week,
-           ROUND(AVG(daily_cal), 0) as avg_calories,
-           ROUND(AVG(daily_protein), 1) as avg_protein,
-           ROUND(AVG(daily_fat), 1) as avg_fat,
-           ROUND(AVG(daily_carbs), 1) as avg_carbs
-    FROM (
-        SELECT strftime('%Y-%W', date) as week, date,
-               SUM(calories_kcal) as daily_cal,
-               SUM(protein_g) as daily_protein,
-               SUM(fat_g) as daily_fat,
-               SUM(carbs_g) as daily_carbs
-        FROM nutrition_entries
-        GROUP BY date
+    daily = _daily_nutrition(conn)
+    weekly = (
+        daily.groupby(daily["date"].dt.strftime("%Y-%W").rename("week"))
+        [["calories", "protein_g", "fat_g", "carbs_g"]]
+        .mean()
+        .round(NUTRITION_DECIMALS)
+        .sort_index(ascending=False)
+        .head(12)
+        .reset_index()
     )
-    GROUP BY week
-    ORDER BY week DESC
-    LIMIT 12
-    """
-    return pd.read_sql_query(query, conn)
+    return weekly.rename(columns={
+        "calories": "avg_calories",
+        "protein_g": "avg_protein",
+        "fat_g": "avg_fat",
+        "carbs_g": "avg_carbs",
+    })
 
 
 # Import management queries
 def get_all_imports(conn: sqlite3.Connection, source_filter: Optional[str] = None) -> pd.DataFrame:
     """Get all imports with optional source filter"""
-    where_clause = ""
-    if source_filter:
-        where_clause = f"WHERE s.name = '{source_filter}'"
-
-    query = f"""
+    query = """
     SELECT l.id, s.name as source, l.file_path, l.import_timestamp,
            l.records_processed, l.records_inserted, l.records_skipped,
-           l.records_conflicted, l.status, l.error_message
+           l.records_conflicted, l.status, l.error_message,
+           CASE l.status WHEN 'completed' THEN '✅'
+                         WHEN 'failed' THEN '❌'
+                         ELSE '⏳' END as status_icon
     FROM import_log l
     JOIN data_sources s ON l.source_id = s.id
-    {where_clause}
+    WHERE (? IS NULL OR s.name = ?)
     ORDER BY l.import_timestamp DESC
     """
-    return pd.read_sql_query(query, conn)
+    source_filter = source_filter or None
+    return pd.read_sql_query(query, conn, params=(source_filter, source_filter))
 
 
 def get_conflicts_detail(conn: sqlite3.Connection, import_id: Optional[int] = None) -> pd.DataFrame:
     """Get detailed conflict information"""
-    where_clause = ""
-    if import_id:
-        where_clause = f"WHERE c.import_id = {import_id}"
-
-    query = f"""
+    query = """
     SELECT c.id, c.import_id, c.table_name, c.record_key,
            c.existing_value, c.new_value, c.conflict_fields, c.resolution
     FROM import_conflicts c
-    {where_clause}
+    WHERE (? IS NULL OR c.import_id = ?)
     ORDER BY c.id DESC
     LIMIT 100
     """
-    return pd.read_sql_query(query, conn)
+    import_id = import_id or None
+    return pd.read_sql_query(query, conn, params=(import_id, import_id))
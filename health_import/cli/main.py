@@ -80,6 +80,15 @@ def cmd_inspect(args: argparse.Namespace) -> int:
             table = args.table
             limit = args.limit or 20
 
+            # Table names can't be bound; only accept existing tables
+            known = db.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,)
+            ).fetchone()
+            if known is None:
+                logger.error(f"Unknown table: {table}")
+                return 1
+
             cursor = db.conn.execute(
                 f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?",
                 (limit,)
@@ -93,12 +102,10 @@ def cmd_inspect(args: argparse.Namespace) -> int:
             # Get column names
             columns = [desc[0] for desc in cursor.description]
 
-            # Print header
-            print(f"\n{table} (showing {len(rows)} records)")
-            print("-" * 80)
-
-            for row in rows:
-                print(dict(row))
+            # Build the listing and write it at once
+            lines = [f"\n{table} (showing {len(rows)} records)", "-" * 80]
+            lines.extend(str(dict(row)) for row in rows)
+            print("\n".join(lines))
 
             return 0
 
@@ -143,26 +150,28 @@ def cmd_conflicts(args: argparse.Namespace) -> int:
                 print("No conflicts found")
                 return 0
 
-            print(f"\nConflicts ({len(rows)} records)")
-            print("=" * 80)
+            # Build the report and write it at once
+            lines = [f"\nConflicts ({len(rows)} records)", "=" * 80]
 
             current_import = None
             for row in rows:
-                row = dict(row)
                 import_id = row["import_id"]
 
                 if import_id != current_import:
                     current_import = import_id
-                    print(f"\nImport #{import_id} ({row['source_name']}) - {row['file_path']}")
-                    print("-" * 60)
-
-                print(f"\n  Table: {row['table_name']}")
-                print(f"  Key: {row['record_key']}")
-                print(f"  Differences:")
-                print(f"    Existing: {row['existing_value']}")
-                print(f"    New:      {row['new_value']}")
-                print(f"  Resolution: {row['resolution']}")
-
+                    lines.append(f"\nImport #{import_id} ({row['source_name']}) - {row['file_path']}")
+                    lines.append("-" * 60)
+
+                lines.extend((
+                    f"\n  Table: {row['table_name']}",
+                    f"  Key: {row['record_key']}",
+                    "  Differences:",
+                    f"    Existing: {row['existing_value']}",
+                    f"    New:      {row['new_value']}",
+                    f"  Resolution: {row['resolution']}",
+                ))
+
+            print("\n".join(lines))
             return 0
 
     except Exception as e:
@@ -1,7 +1,8 @@
 """Conflict detection and resolution for imports"""
 import json
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import sqlite3
 
 from .logging_setup import get_logger
@@ -30,23 +31,40 @@ TOLERANCES = {
     "vo2max_value": 0.1,
 }
 
+# Conflicts buffered before they are written in one executemany
+CONFLICT_BATCH_SIZE = 500
 
-def values_match(field: str, existing: Any, new: Any) -> bool:
-    """Check if two values match, accounting for tolerances"""
-    if existing is None and new is None:
-        return True
-    if existing is None or new is None:
-        return False
-
-    # Check if field has a tolerance
-    tolerance = TOLERANCES.get(field)
-    if tolerance is not None:
+
+def _equal(existing: Any, new: Any) -> bool:
+    """Compare a field without tolerance"""
+    return existing == new
+
+
+def _within(tolerance: float) -> Callable[[Any, Any], bool]:
+    """Build a comparator accepting numeric differences up to tolerance"""
+    def match(existing: Any, new: Any) -> bool:
+        if existing is None or new is None:
+            return existing is new
         try:
             return abs(float(existing) - float(new)) <= tolerance
         except (ValueError, TypeError):
-            pass
+            return existing == new
+    return match
 
-    return existing == new
+
+@lru_cache(maxsize=None)
+def _comparators(fields: Tuple[str, ...]) -> Tuple[Tuple[str, Callable[[Any, Any], bool]], ...]:
+    """Pair each field with its comparator, built once per field list"""
+    return tuple(
+        (field, _within(TOLERANCES[field]) if field in TOLERANCES else _equal)
+        for field in fields
+    )
+
+
+def values_match(field: str, existing: Any, new: Any) -> bool:
+    """Check if two values match, accounting for tolerances"""
+    (_, match), = _comparators((field,))
+    return match(existing, new)
 
 
 class ConflictDetector:
@@ -56,18 +74,21 @@ class ConflictDetector:
         self.conn = conn
         self.import_id = import_id
         self.logger = get_logger()
+        self._pending: List[Tuple] = []
 
     def check_exists(
         self,
         table: str,
-        key_fields: Dict[str, Any]
+        key_fields: Dict[str, Any],
+        select_fields: Optional[List[str]] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Check if record exists by natural key.
-        Returns existing record as dict or None.
+        Returns existing record as dict (only select_fields, if given) or None.
         """
+        columns = "*" if select_fields is None else ", ".join(select_fields) or "1"
         where_clause = " AND ".join(f"{k} = ?" for k in key_fields.keys())
-        query = f"SELECT * FROM {table} WHERE {where_clause}"
+        query = f"SELECT {columns} FROM {table} WHERE {where_clause}"
 
         cursor = self.conn.execute(query, tuple(key_fields.values()))
         row = cursor.fetchone()
@@ -92,11 +113,6 @@ class ConflictDetector:
             - (True, None) if exists and values match
             - (True, ConflictInfo) if exists and values differ
         """
-        existing = self.check_exists(table, key_fields)
-
-        if existing is None:
-            return (False, None)
-
         # Determine fields to compare
         if compare_fields is None:
             # Compare all fields except metadata
@@ -106,12 +122,18 @@ class ConflictDetector:
                 if k not in skip_fields and k not in key_fields
             ]
 
+        # Only the compared columns are needed from the stored row
+        existing = self.check_exists(table, key_fields, compare_fields)
+
+        if existing is None:
+            return (False, None)
+
         # Find differing fields
-        conflict_fields = []
-        for field in compare_fields:
-            if field in existing and field in new_data:
-                if not values_match(field, existing[field], new_data[field]):
-                    conflict_fields.append(field)
+        conflict_fields = [
+            field for field, match in _comparators(tuple(compare_fields))
+            if field in existing and field in new_data
+            and not match(existing[field], new_data[field])
+        ]
 
         if not conflict_fields:
             return (True, None)  # Exists, values match
@@ -138,17 +160,30 @@ class ConflictDetector:
             self.logger.warning(f"       {field}: {existing} -> {new}")
         self.logger.warning("       Keeping existing record")
 
-        # Log to database
-        self.conn.execute(
+        # Queue for the database; written in batches by flush()
+        self._pending.append((
+            self.import_id,
+            conflict.table_name,
+            json.dumps(conflict.record_key),
+            json.dumps(conflict.existing_value),
+            json.dumps(conflict.new_value),
+            json.dumps(conflict.conflict_fields)
+        ))
+        if len(self._pending) >= CONFLICT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write queued conflicts to the database.
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        if not self._pending:
+            return
+        # Take the batch first so a failed write isn't retried by a later flush
+        pending, self._pending = self._pending, []
+        self.conn.executemany(
             """INSERT INTO import_conflicts
                (import_id, table_name, record_key, existing_value, new_value, conflict_fields)
                VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                self.import_id,
-                conflict.table_name,
-                json.dumps(conflict.record_key),
-                json.dumps(conflict.existing_value),
-                json.dumps(conflict.new_value),
-                json.dumps(conflict.conflict_fields)
-            )
+            pending
         )
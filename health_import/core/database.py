@@ -1,7 +1,9 @@
 """Database connection and schema initialization"""
 import sqlite3
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
+
+from .rollups import ensure_rollups
 
 DEFAULT_DB_PATH = Path("data/prod/health_data.db")
 TEST_DB_PATH = Path("data/test/health_data.db")
@@ -15,6 +17,11 @@ class Database:
         self.db_path = db_path or DEFAULT_DB_PATH
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._conn: Optional[sqlite3.Connection] = None
+        # Reference lookups repeat for every imported row; remember them
+        # for the life of this Database
+        self._source_ids: Dict[str, int] = {}
+        self._activity_type_ids: Dict[str, Optional[int]] = {}
+        self._exercise_ids: Dict[str, Optional[int]] = {}
 
     @property
     def conn(self) -> sqlite3.Connection:
@@ -22,6 +29,13 @@ class Database:
             self._conn = sqlite3.connect(self.db_path)
             self._conn.row_factory = sqlite3.Row
             self._conn.execute("PRAGMA foreign_keys = ON")
+            # WAL keeps dashboard reads going during imports; with it,
+            # NORMAL only syncs at checkpoints instead of every commit
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("PRAGMA temp_store = MEMORY")
+            self._conn.execute("PRAGMA mmap_size = 268435456")
+            self._conn.execute("PRAGMA cache_size = -65536")
         return self._conn
 
     def init_schema(self) -> None:
@@ -31,10 +45,18 @@ class Database:
 
         schema_sql = SCHEMA_PATH.read_text()
         self.conn.executescript(schema_sql)
+        ensure_rollups(self.conn)
+
+        # Give the planner index statistics, sampling rows to keep this quick
+        self.conn.execute("PRAGMA analysis_limit = 400")
+        self.conn.execute("ANALYZE")
         self.conn.commit()
 
     def get_source_id(self, source_name: str) -> int:
         """Get source ID by name"""
+        if source_name in self._source_ids:
+            return self._source_ids[source_name]
+
         cursor = self.conn.execute(
             "SELECT id FROM data_sources WHERE name = ?",
             (source_name,)
@@ -42,6 +64,7 @@ class Database:
         row = cursor.fetchone()
         if row is None:
             raise ValueError(f"Unknown data source: {source_name}")
+        self._source_ids[source_name] = row["id"]
         return row["id"]
 
     def create_import_log(self, source_id: int, file_path: str) -> int:
@@ -80,15 +103,22 @@ class Database:
 
     def get_activity_type_id(self, garmin_type: str) -> Optional[int]:
         """Get activity type ID by Garmin type name"""
+        if garmin_type in self._activity_type_ids:
+            return self._activity_type_ids[garmin_type]
+
         cursor = self.conn.execute(
             "SELECT id FROM activity_types WHERE garmin_type = ?",
             (garmin_type,)
         )
         row = cursor.fetchone()
-        return row["id"] if row else None
+        self._activity_type_ids[garmin_type] = row["id"] if row else None
+        return self._activity_type_ids[garmin_type]
 
     def get_exercise_id(self, name: str) -> Optional[int]:
         """Get exercise ID by name or display_name (with normalization)"""
+        if name in self._exercise_ids:
+            return self._exercise_ids[name]
+
         # Normalize: lowercase, replace spaces/hyphens with underscore
         normalized = name.lower().replace(" ", "_").replace("-", "_")
         # Also try without trailing 's' for singular/plural matching
@@ -102,7 +132,8 @@ class Database:
             (name, name, normalized, normalized_singular, normalized, normalized)
         )
         row = cursor.fetchone()
-        return row["id"] if row else None
+        self._exercise_ids[name] = row["id"] if row else None
+        return self._exercise_ids[name]
 
     def add_exercise(self, name: str, display_name: str, category: str, unit: str = "reps") -> int:
         """Add new exercise type"""
@@ -112,6 +143,8 @@ class Database:
             (name.lower().replace(" ", "_").replace("-", "_"), display_name, category, unit)
         )
         self.conn.commit()
+        # Names that missed before may match the new exercise
+        self._exercise_ids.clear()
         return cursor.lastrowid
 
     def close(self) -> None:
@@ -1,8 +1,12 @@
 """Logging configuration for health data import"""
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 LOGGER_NAME = "health_import"
 LOG_DIR = Path(__file__).parent.parent.parent / "logs"
@@ -23,6 +27,47 @@ class ConflictLogger(logging.Logger):
 logging.setLoggerClass(ConflictLogger)
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter reusing the formatted timestamp for records in the same second.
+
+    The default format (no datefmt) adds milliseconds, so it isn't cached.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_key = None
+        self._cached_time = ""
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt is None:
+            return super().formatTime(record, datefmt)
+        key = (int(record.created), datefmt)
+        if key != self._cached_key:
+            self._cached_key = key
+            self._cached_time = super().formatTime(record, datefmt)
+        return self._cached_time
+
+
+# Background thread writing queued records to the log file, and the handler
+# feeding it; opened once per process and reused by later setup_logging calls
+_file_listener: Optional[logging.handlers.QueueListener] = None
+_file_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def _stop_file_listener() -> None:
+    """Drain queued records to the log file and close it"""
+    global _file_listener, _file_queue_handler
+    if _file_listener is not None:
+        _file_listener.stop()
+        for handler in _file_listener.handlers:
+            handler.close()
+        _file_listener = None
+        _file_queue_handler = None
+
+
+atexit.register(_stop_file_listener)
+
+
 def setup_logging(verbosity: int = 0, quiet: bool = False, log_to_file: bool = True) -> logging.Logger:
     """
     Configure logging based on verbosity level.
@@ -33,6 +78,7 @@ def setup_logging(verbosity: int = 0, quiet: bool = False, log_to_file: bool = T
     quiet=True: errors only
     log_to_file: also write to logs/import.log
     """
+    global _file_listener, _file_queue_handler
     logger = logging.getLogger(LOGGER_NAME)
     logger.handlers.clear()
 
@@ -55,14 +101,22 @@ def setup_logging(verbosity: int = 0, quiet: bool = False, log_to_file: bool = T
     logger.addHandler(console_handler)
 
     # File handler
-    if log_to_file:
+    if log_to_file and _file_listener is None:
         LOG_DIR.mkdir(exist_ok=True)
         log_file = LOG_DIR / "import.log"
         file_handler = logging.FileHandler(log_file, encoding="utf-8")
         file_handler.setLevel(logging.DEBUG)  # Always log everything to file
-        file_fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        file_fmt = CachedTimeFormatter("%(asctime)s [%(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
         file_handler.setFormatter(file_fmt)
-        logger.addHandler(file_handler)
+
+        # Write the file from a listener thread so imports don't wait on disk
+        log_queue = queue.SimpleQueue()
+        _file_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _file_listener.start()
+        _file_queue_handler = logging.handlers.QueueHandler(log_queue)
+
+    if log_to_file:
+        logger.addHandler(_file_queue_handler)
 
     return logger
 
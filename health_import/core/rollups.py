@@ -0,0 +1,89 @@
+"""Precomputed activity and nutrition aggregates for the dashboard
+
+The rollup tables are derived entirely from their source tables, so they
+can be dropped or rebuilt at any time. Schema setup builds any that are
+missing; importers that write the source tables refresh them once at the
+end of a run.
+"""
+import sqlite3
+
+ACTIVITIES_SUMMARY_SQL = """
+    SELECT COALESCE(t.name, 'Unknown') as activity_type,
+           COUNT(*) as count,
+           ROUND(SUM(a.distance_miles), 1) as total_miles,
+           ROUND(SUM(a.calories_total), 0) as total_calories,
+           ROUND(AVG(a.avg_hr), 0) as avg_hr,
+           ROUND(AVG(a.duration_seconds)/60, 1) as avg_duration_min
+    FROM activities a
+    LEFT JOIN activity_types t ON a.activity_type_id = t.id
+    GROUP BY t.name
+"""
+
+WEEKLY_ACTIVITIES_SQL = """
+    SELECT strftime('%Y-%W', start_time) as week,
+           COUNT(*) as activities,
+           ROUND(SUM(distance_miles), 1) as miles,
+           ROUND(SUM(calories_total), 0) as calories
+    FROM activities
+    GROUP BY week
+"""
+
+DAILY_NUTRITION_SQL = """
+    SELECT date,
+           SUM(calories_kcal) as calories,
+           SUM(protein_g) as protein_g,
+           SUM(fat_g) as fat_g,
+           SUM(carbs_g) as carbs_g,
+           SUM(fiber_g) as fiber_g
+    FROM nutrition_entries
+    GROUP BY date
+"""
+
+ACTIVITY_ROLLUPS = {
+    "activities_summary_cache": ACTIVITIES_SUMMARY_SQL,
+    "weekly_activities_cache": WEEKLY_ACTIVITIES_SQL,
+}
+
+NUTRITION_ROLLUPS = {
+    "daily_nutrition_cache": DAILY_NUTRITION_SQL,
+}
+
+
+def _rebuild(conn: sqlite3.Connection, rollups: dict) -> None:
+    """Recreate each rollup table's contents from its defining query"""
+    for table, select_sql in rollups.items():
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} AS {select_sql} LIMIT 0"
+        )
+        conn.execute(f"DELETE FROM {table}")
+        conn.execute(f"INSERT INTO {table} {select_sql}")
+
+
+def refresh_activity_rollups(conn: sqlite3.Connection) -> None:
+    """Rebuild the activity rollup tables from activities.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    _rebuild(conn, ACTIVITY_ROLLUPS)
+
+
+def refresh_nutrition_rollups(conn: sqlite3.Connection) -> None:
+    """Rebuild the nutrition rollup tables from nutrition_entries.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    _rebuild(conn, NUTRITION_ROLLUPS)
+
+
+def ensure_rollups(conn: sqlite3.Connection) -> None:
+    """Build any rollup table missing from the database.
+
+    Runs inside the caller's transaction; the caller commits.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    missing = {
+        table: select_sql
+        for table, select_sql in {**ACTIVITY_ROLLUPS, **NUTRITION_ROLLUPS}.items()
+        if table not in existing
+    }
+    _rebuild(conn, missing)
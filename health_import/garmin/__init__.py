@@ -1,10 +1,10 @@
 """Garmin Connect data importers"""
 from health_import.garmin.vo2max import GarminVO2MaxFetcher, import_vo2max_to_db, get_existing_vo2max
-from health_import.garmin.activities import GarminActivityFetcher, import_activities_to_db
+from health_import.garmin.activities import GarminActivityFetcher, fetch_splits_for_import, import_activities_to_db
 from health_import.garmin.weight import GarminWeightFetcher, import_weight_to_db, convert_api_weight
 
 __all__ = [
     'GarminVO2MaxFetcher', 'import_vo2max_to_db', 'get_existing_vo2max',
-    'GarminActivityFetcher', 'import_activities_to_db',
+    'GarminActivityFetcher', 'fetch_splits_for_import', 'import_activities_to_db',
     'GarminWeightFetcher', 'import_weight_to_db', 'convert_api_weight',
 ]
@@ -1,11 +1,15 @@
 """Garmin activities API fetcher and shared import logic"""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 import sqlite3
 
 from garminconnect import Garmin
 
+from ..core.rollups import refresh_activity_rollups
+
 # Token file for session persistence
 TOKEN_DIR = Path(__file__).parent.parent.parent / "data" / ".garmin"
 TOKEN_FILE = TOKEN_DIR / "session.json"
@@ -17,6 +21,65 @@ MPS_TO_MPH = 2.23694
 CM_TO_FEET = 0.0328084
 CM_TO_INCHES = 0.393701
 
+# Concurrent Garmin API requests (activity windows, lap/splits); kept low to
+# stay polite to Garmin's API
+API_WORKERS = 4
+
+# Long activity ranges are fetched as windows of this many days in parallel
+ACTIVITY_WINDOW_DAYS = 30
+
+# Converted fields stored by each insert, in column order. Each insert also
+# takes the owning ids first: source_id and activity_type_id for activities,
+# activity_id for the rest.
+ACTIVITY_COLUMNS = (
+    'start_time', 'duration_seconds', 'moving_time_seconds', 'title', 'distance_miles',
+    'calories_total', 'avg_speed_mph', 'max_speed_mph', 'avg_pace_min_per_mile',
+    'avg_hr', 'max_hr', 'elevation_gain_ft', 'elevation_loss_ft',
+    'min_elevation_ft', 'max_elevation_ft',
+)
+EXTRAS_COLUMNS = (
+    'garmin_activity_id', 'event_type', 'location_name', 'aerobic_te',
+    'anaerobic_te', 'training_load', 'vo2max_value', 'steps',
+)
+DYNAMICS_COLUMNS = (
+    'avg_cadence', 'max_cadence', 'avg_power_watts', 'max_power_watts',
+    'normalized_power_watts', 'avg_stride_length_ft', 'avg_vertical_oscillation_in',
+    'avg_ground_contact_time_ms', 'avg_vertical_ratio',
+)
+LAP_COLUMNS = (
+    'lap_index', 'start_time', 'distance_miles', 'duration_seconds',
+    'moving_duration_seconds', 'avg_speed_mph', 'max_speed_mph', 'avg_pace_min_per_mile',
+    'avg_hr', 'max_hr', 'avg_cadence', 'max_cadence', 'avg_power_watts', 'max_power_watts',
+    'normalized_power_watts', 'calories', 'elevation_gain_ft', 'elevation_loss_ft',
+    'avg_stride_length_ft', 'avg_vertical_oscillation_in', 'avg_ground_contact_time_ms',
+    'avg_vertical_ratio',
+)
+
+
+def _insert_sql(verb: str, table: str, columns: tuple) -> str:
+    """Build an INSERT statement for the given columns"""
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+
+
+ACTIVITY_INSERT_SQL = _insert_sql("INSERT", "activities", ('source_id', 'activity_type_id') + ACTIVITY_COLUMNS)
+EXTRAS_INSERT_SQL = _insert_sql("INSERT OR REPLACE", "activity_garmin_extras", ('activity_id',) + EXTRAS_COLUMNS)
+DYNAMICS_INSERT_SQL = _insert_sql("INSERT OR REPLACE", "activity_running_dynamics", ('activity_id',) + DYNAMICS_COLUMNS)
+LAP_INSERT_SQL = _insert_sql("INSERT OR REPLACE", "activity_laps", ('activity_id',) + LAP_COLUMNS)
+
+# Pull a converted dict's values straight into insert order
+_activity_values = itemgetter(*ACTIVITY_COLUMNS)
+_extras_values = itemgetter(*EXTRAS_COLUMNS)
+_dynamics_values = itemgetter(*DYNAMICS_COLUMNS)
+_lap_values = itemgetter(*LAP_COLUMNS)
+
+# Parallel activity requests all go through this one pool, so concurrent
+# fetches and imports share API_WORKERS threads rather than each starting
+# their own. The pool threads share the fetcher's Garmin client, whose
+# session refresh isn't known to be thread-safe: fetch_activities makes its
+# first request on the calling thread, and failed pooled requests (activity
+# windows and splits) are retried there.
+_api_pool = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="garmin-api")
+
 
 class GarminActivityFetcher:
     """Fetches activity data from Garmin Connect API"""
@@ -68,10 +131,49 @@ class GarminActivityFetcher:
             raise Exception("Not logged in")
 
         end = end_date or date.today()
-        activities = self.client.get_activities_by_date(
-            start_date.isoformat(), end.isoformat()
-        )
-        return activities or []
+
+        # Split long ranges into windows, newest first to keep Garmin's order
+        windows = []
+        window_end = end
+        while window_end >= start_date:
+            window_start = max(start_date, window_end - timedelta(days=ACTIVITY_WINDOW_DAYS - 1))
+            windows.append((window_start.isoformat(), window_end.isoformat()))
+            window_end = window_start - timedelta(days=1)
+
+        if not windows:
+            return []
+
+        # The newest window is fetched here, before the rest fan out
+        results = [self.client.get_activities_by_date(*windows[0])]
+        if len(windows) == 1:
+            return results[0] or []
+        futures = [
+            _api_pool.submit(self.client.get_activities_by_date, *window)
+            for window in windows[1:]
+        ]
+        try:
+            for window, future in zip(windows[1:], futures):
+                try:
+                    results.append(future.result())
+                except Exception:
+                    # The pooled request failed; retry on this thread
+                    results.append(self.client.get_activities_by_date(*window))
+        finally:
+            # Leave the shared pool free if a retry fails too
+            for future in futures:
+                future.cancel()
+
+        # Drop any activity returned by two neighbouring windows
+        activities = []
+        seen = set()
+        for window_activities in results:
+            for activity in window_activities or []:
+                activity_id = activity.get('activityId')
+                if activity_id in seen:
+                    continue
+                seen.add(activity_id)
+                activities.append(activity)
+        return activities
 
     def fetch_activity_splits(self, activity_id: int) -> Optional[dict]:
         """Fetch lap/split data for an activity"""
@@ -232,12 +334,93 @@ def _get_or_create_activity_type(conn: sqlite3.Connection, garmin_type: str) ->
     return cursor.lastrowid
 
 
+def _activities_to_write(conn: sqlite3.Connection, activities: list[dict]) -> list[dict]:
+    """
+    Pick the activities import_activities_to_db will write, without writing.
+
+    Mirrors its rules: an imported Garmin id is skipped, and linking a Garmin
+    id to an activity (new, or existing with the same start time) unlinks
+    the id that activity had, so that one is written again later.
+    """
+    garmin_ids = dict(conn.execute(
+        "SELECT activity_id, garmin_activity_id FROM activity_garmin_extras "
+        "WHERE garmin_activity_id IS NOT NULL"
+    ))
+    known_garmin_ids = set(garmin_ids.values())
+    activity_ids_by_start = dict(conn.execute(
+        "SELECT start_time, id FROM activities WHERE start_time IS NOT NULL ORDER BY id DESC"
+    ))
+
+    to_write = []
+    for index, activity in enumerate(activities):
+        garmin_id = activity.get('activityId')
+        if garmin_id in known_garmin_ids:
+            continue
+        to_write.append(activity)
+
+        # Activities not inserted yet stand in with a placeholder id
+        start_time = activity.get('startTimeLocal')
+        activity_id = activity_ids_by_start.get(start_time)
+        if activity_id is None:
+            activity_id = ('new', index)
+            if start_time is not None:
+                activity_ids_by_start[start_time] = activity_id
+
+        known_garmin_ids.discard(garmin_ids.pop(activity_id, None))
+        if garmin_id is not None:
+            garmin_ids[activity_id] = garmin_id
+            known_garmin_ids.add(garmin_id)
+    return to_write
+
+
+def fetch_splits_for_import(
+    conn: sqlite3.Connection,
+    fetcher: GarminActivityFetcher,
+    activities: list[dict],
+    status=None,
+) -> dict:
+    """
+    Download lap/split data for the activities an import will write.
+
+    Activities the import will skip are left out. Call this before opening
+    the import's transaction so no write lock is held during the downloads.
+
+    Returns:
+        {garmin_activity_id: splits dict or None}
+    """
+    # Request every activity's laps up front, then collect them in order
+    pending = {}
+    names = {}
+    for activity in _activities_to_write(conn, activities):
+        garmin_id = activity.get('activityId')
+        if garmin_id not in pending:
+            pending[garmin_id] = _api_pool.submit(fetcher.fetch_activity_splits, garmin_id)
+            names[garmin_id] = activity.get('activityName') or f"Activity {garmin_id}"
+
+    splits = {}
+    try:
+        for count, (garmin_id, future) in enumerate(pending.items(), 1):
+            if status:
+                status.write(f"[{count}/{len(pending)}] {names[garmin_id]} - fetching laps...")
+            result = future.result()
+            if result is None:
+                # The pooled request failed; retry on this thread
+                result = fetcher.fetch_activity_splits(garmin_id)
+            splits[garmin_id] = result
+    finally:
+        # Leave the shared pool free if the fetch stops early
+        for future in pending.values():
+            future.cancel()
+    return splits
+
+
 def import_activities_to_db(
     conn: sqlite3.Connection,
     fetcher: GarminActivityFetcher,
     activities: list[dict],
     source_id: int,
     status=None,
+    splits: Optional[dict] = None,
 ) -> dict:
     """
     Import activities and their laps to database.
@@ -246,6 +429,9 @@ def import_activities_to_db(
     - If activity with same start_time exists: link laps/extras to it (enrichment)
     - Otherwise: create new activity with laps/extras
 
+    splits comes from fetch_splits_for_import and is fetched here when not
+    given; pass it in to keep the downloads out of the caller's transaction.
+
     Returns:
         {processed: int, inserted: int, enriched: int, skipped: int, laps_inserted: int}
     """
@@ -256,16 +442,30 @@ def import_activities_to_db(
     laps_inserted = 0
     total = len(activities)
 
+    # Load imported Garmin ids and activity start times once, not per activity
+    garmin_ids = dict(conn.execute(
+        "SELECT activity_id, garmin_activity_id FROM activity_garmin_extras "
+        "WHERE garmin_activity_id IS NOT NULL"
+    ))
+    known_garmin_ids = set(garmin_ids.values())
+    # Descending so the lowest id wins for a shared start time
+    activity_ids_by_start = dict(conn.execute(
+        "SELECT start_time, id FROM activities WHERE start_time IS NOT NULL ORDER BY id DESC"
+    ))
+    # Few distinct activity types; resolve each once per import
+    type_ids: Dict[str, int] = {}
+
+    if splits is None:
+        splits = fetch_splits_for_import(conn, fetcher, activities, status)
+    if status:
+        status.write(f"Saving {total} activities...")
+
     for activity in activities:
         processed += 1
         garmin_id = activity.get('activityId')
 
         # Check if garmin_activity_id already imported
-        existing_garmin = conn.execute(
-            "SELECT activity_id FROM activity_garmin_extras WHERE garmin_activity_id = ?",
-            (garmin_id,)
-        ).fetchone()
-        if existing_garmin:
+        if garmin_id in known_garmin_ids:
             skipped += 1
             continue
 
@@ -274,162 +474,52 @@ def import_activities_to_db(
         start_time = data['start_time']
 
         # Get activity type ID
-        activity_type = data.pop('activity_type', None)
+        activity_type = data['activity_type']
         type_id = None
         if activity_type:
-            type_id = _get_or_create_activity_type(conn, activity_type)
-
-        # Extract garmin extras
-        garmin_activity_id = data.pop('garmin_activity_id')
-        event_type = data.pop('event_type', None)
-        location_name = data.pop('location_name', None)
-        aerobic_te = data.pop('aerobic_te', None)
-        anaerobic_te = data.pop('anaerobic_te', None)
-        training_load = data.pop('training_load', None)
-        vo2max_value = data.pop('vo2max_value', None)
-        steps = data.pop('steps', None)
-
-        # Extract running dynamics
-        avg_cadence = data.pop('avg_cadence', None)
-        max_cadence = data.pop('max_cadence', None)
-        avg_power_watts = data.pop('avg_power_watts', None)
-        max_power_watts = data.pop('max_power_watts', None)
-        normalized_power_watts = data.pop('normalized_power_watts', None)
-        avg_stride_length_ft = data.pop('avg_stride_length_ft', None)
-        avg_vertical_oscillation_in = data.pop('avg_vertical_oscillation_in', None)
-        avg_ground_contact_time_ms = data.pop('avg_ground_contact_time_ms', None)
-        avg_vertical_ratio = data.pop('avg_vertical_ratio', None)
+            type_id = type_ids.get(activity_type)
+            if type_id is None:
+                type_id = type_ids[activity_type] = _get_or_create_activity_type(conn, activity_type)
 
         # Check if activity with same start_time exists (from CSV import)
-        existing_activity = conn.execute(
-            "SELECT id FROM activities WHERE start_time = ?",
-            (start_time,)
-        ).fetchone()
+        activity_id = activity_ids_by_start.get(start_time)
 
-        if existing_activity:
+        if activity_id is not None:
             # Enrich existing activity with garmin extras and laps
-            activity_id = existing_activity[0]
             enriched += 1
         else:
             # Insert new activity
-            cursor = conn.execute(
-                """INSERT INTO activities (
-                    source_id, activity_type_id, start_time, duration_seconds, moving_time_seconds,
-                    title, distance_miles, calories_total, avg_speed_mph, max_speed_mph,
-                    avg_pace_min_per_mile, avg_hr, max_hr,
-                    elevation_gain_ft, elevation_loss_ft, min_elevation_ft, max_elevation_ft
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    source_id,
-                    type_id,
-                    data['start_time'],
-                    data['duration_seconds'],
-                    data['moving_time_seconds'],
-                    data['title'],
-                    data['distance_miles'],
-                    data['calories_total'],
-                    data['avg_speed_mph'],
-                    data['max_speed_mph'],
-                    data['avg_pace_min_per_mile'],
-                    data['avg_hr'],
-                    data['max_hr'],
-                    data['elevation_gain_ft'],
-                    data['elevation_loss_ft'],
-                    data['min_elevation_ft'],
-                    data['max_elevation_ft'],
-                )
-            )
+            cursor = conn.execute(ACTIVITY_INSERT_SQL, (source_id, type_id, *_activity_values(data)))
             activity_id = cursor.lastrowid
             inserted += 1
+            if start_time is not None:
+                activity_ids_by_start[start_time] = activity_id
 
         # Insert garmin extras (or update if exists)
-        conn.execute(
-            """INSERT OR REPLACE INTO activity_garmin_extras (
-                activity_id, garmin_activity_id, event_type, location_name,
-                aerobic_te, anaerobic_te, training_load, vo2max_value, steps
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                activity_id,
-                garmin_activity_id,
-                event_type,
-                location_name,
-                aerobic_te,
-                anaerobic_te,
-                training_load,
-                vo2max_value,
-                steps,
-            )
-        )
+        conn.execute(EXTRAS_INSERT_SQL, (activity_id, *_extras_values(data)))
+        # The replace unlinks any Garmin id this activity had before
+        garmin_activity_id = data['garmin_activity_id']
+        known_garmin_ids.discard(garmin_ids.pop(activity_id, None))
+        if garmin_activity_id is not None:
+            garmin_ids[activity_id] = garmin_activity_id
+            known_garmin_ids.add(garmin_activity_id)
 
         # Insert or update running dynamics if present
-        if any([avg_cadence, avg_power_watts, avg_stride_length_ft, avg_vertical_oscillation_in]):
-            conn.execute(
-                """INSERT OR REPLACE INTO activity_running_dynamics (
-                    activity_id, avg_cadence, max_cadence, avg_power_watts, max_power_watts,
-                    normalized_power_watts, avg_stride_length_ft, avg_vertical_oscillation_in,
-                    avg_ground_contact_time_ms, avg_vertical_ratio
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    activity_id,
-                    avg_cadence,
-                    max_cadence,
-                    avg_power_watts,
-                    max_power_watts,
-                    normalized_power_watts,
-                    avg_stride_length_ft,
-                    avg_vertical_oscillation_in,
-                    avg_ground_contact_time_ms,
-                    avg_vertical_ratio,
-                )
-            )
-
-        # Fetch and insert laps
-        if status:
-            activity_name = data.get('title') or f"Activity {garmin_id}"
-            status.write(f"[{processed}/{total}] {activity_name} - fetching laps...")
-        splits = fetcher.fetch_activity_splits(garmin_id)
-        if splits and 'lapDTOs' in splits:
-            for lap in splits['lapDTOs']:
-                lap_index = lap.get('lapIndex', 0)
-                lap_data = _convert_lap(lap, lap_index)
-
-                conn.execute(
-                    """INSERT OR REPLACE INTO activity_laps (
-                        activity_id, lap_index, start_time, distance_miles, duration_seconds,
-                        moving_duration_seconds, avg_speed_mph, max_speed_mph, avg_pace_min_per_mile,
-                        avg_hr, max_hr, avg_cadence, max_cadence, avg_power_watts, max_power_watts,
-                        normalized_power_watts, calories, elevation_gain_ft, elevation_loss_ft,
-                        avg_stride_length_ft, avg_vertical_oscillation_in, avg_ground_contact_time_ms,
-                        avg_vertical_ratio
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (
-                        activity_id,
-                        lap_data['lap_index'],
-                        lap_data['start_time'],
-                        lap_data['distance_miles'],
-                        lap_data['duration_seconds'],
-                        lap_data['moving_duration_seconds'],
-                        lap_data['avg_speed_mph'],
-                        lap_data['max_speed_mph'],
-                        lap_data['avg_pace_min_per_mile'],
-                        lap_data['avg_hr'],
-                        lap_data['max_hr'],
-                        lap_data['avg_cadence'],
-                        lap_data['max_cadence'],
-                        lap_data['avg_power_watts'],
-                        lap_data['max_power_watts'],
-                        lap_data['normalized_power_watts'],
-                        lap_data['calories'],
-                        lap_data['elevation_gain_ft'],
-                        lap_data['elevation_loss_ft'],
-                        lap_data['avg_stride_length_ft'],
-                        lap_data['avg_vertical_oscillation_in'],
-                        lap_data['avg_ground_contact_time_ms'],
-                        lap_data['avg_vertical_ratio'],
-                    )
-                )
-                laps_inserted += 1
-
+        if any(itemgetter('avg_cadence', 'avg_power_watts', 'avg_stride_length_ft', 'avg_vertical_oscillation_in')(data)):
+            conn.execute(DYNAMICS_INSERT_SQL, (activity_id, *_dynamics_values(data)))
+
+        # Insert laps
+        activity_splits = splits.get(garmin_id)
+        if activity_splits and 'lapDTOs' in activity_splits:
+            # All of an activity's laps go in with one executemany
+            lap_rows = [
+                (activity_id, *_lap_values(_convert_lap(lap, lap.get('lapIndex', 0))))
+                for lap in activity_splits['lapDTOs']
+            ]
+            conn.executemany(LAP_INSERT_SQL, lap_rows)
+            laps_inserted += len(lap_rows)
+
+    refresh_activity_rollups(conn)
     conn.commit()
     return {
         'processed': processed,
@@ -53,6 +53,7 @@ class GarminVO2MaxFetcher:
         days_back: Optional[int] = None,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        skip_dates: Optional[set[str]] = None,
     ) -> list[dict]:
         """
         Fetch VO2 Max readings from Garmin.
@@ -61,6 +62,7 @@ class GarminVO2MaxFetcher:
             days_back: Number of days to go back from today
             start_date: Start date for range
             end_date: End date for range (defaults to today)
+            skip_dates: ISO dates not to request, e.g. already stored ones
 
         Returns:
             List of {date: str, vo2max: float, activity_type: str}
@@ -82,8 +84,12 @@ class GarminVO2MaxFetcher:
         vo2_readings = []
         seen_dates = set()
 
+        skip_dates = skip_dates or set()
         current = end
         while current >= start:
+            if current.isoformat() in skip_dates:
+                current -= timedelta(days=1)
+                continue
             try:
                 data = self.client.get_training_status(current.isoformat())
                 if data and 'mostRecentVO2Max' in data:
@@ -128,6 +134,23 @@ class GarminVO2MaxFetcher:
         return vo2_readings
 
 
+def get_stored_vo2max_dates(conn: sqlite3.Connection, start: date, end: date) -> set[str]:
+    """
+    Get dates in a range that already have a reading for every stored
+    activity type, so fetching those days again cannot find anything new.
+    """
+    cursor = conn.execute(
+        """SELECT measurement_date
+           FROM garmin_vo2max
+           WHERE measurement_date BETWEEN ? AND ?
+           GROUP BY measurement_date
+           HAVING COUNT(DISTINCT activity_type) =
+                  (SELECT COUNT(DISTINCT activity_type) FROM garmin_vo2max)""",
+        (start.isoformat(), end.isoformat())
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
 def import_vo2max_to_db(
     conn: sqlite3.Connection,
     readings: list[dict],
@@ -48,7 +48,7 @@ class AppleRestingHRImporter(BaseImporter):
 
                     # Progress logging
                     if count % 100 == 0:
-                        self.logger.debug(f"Processed {count} resting HR records...")
+                        self.logger.debug("Processed %d resting HR records...", count)
 
                 # Clear element to free memory
                 elem.clear()
@@ -135,4 +135,4 @@ class AppleRestingHRImporter(BaseImporter):
     def _log_skip(self, record: Dict[str, Any]) -> None:
         """Log skip"""
         date = record.get("startDate", "")[:10]
-        self.logger.debug(f"Skipped: {date} (already exists)")
+        self.logger.debug("Skipped: %s (already exists)", date)
@@ -60,9 +60,11 @@ class BaseImporter(ABC):
                 elif outcome == "conflict":
                     result.conflicted += 1
 
-            self.db.conn.commit()
+            self.conflict_detector.flush()
+            self._after_import()
 
-            # Update import log
+            # Update import log; its commit also commits the imported records,
+            # so they land together with the completed status
             self.db.update_import_log(
                 self.import_id,
                 result.processed,
@@ -84,6 +86,12 @@ class BaseImporter(ABC):
                 )
 
         except Exception as e:
+            # Keep the conflicts seen so far alongside the partial import; the
+            # failed status must be recorded even if that write fails too
+            try:
+                self.conflict_detector.flush()
+            except Exception as flush_error:
+                self.logger.error(f"Could not save conflicts: {flush_error}")
             self.db.update_import_log(
                 self.import_id,
                 result.processed,
@@ -111,6 +119,10 @@ class BaseImporter(ABC):
         """
         pass
 
+    def _after_import(self) -> None:
+        """Hook run after all records are processed, before commit. Override if needed."""
+        pass
+
     def _insert_with_conflict_check(
         self,
         table: str,
@@ -147,8 +159,8 @@ class BaseImporter(ABC):
 
     def _log_insert(self, record: Dict[str, Any]) -> None:
         """Log insert at verbose level. Override for custom formatting."""
-        self.logger.debug(f"Inserted: {record}")
+        self.logger.debug("Inserted: %s", record)
 
     def _log_skip(self, record: Dict[str, Any]) -> None:
         """Log skip at verbose level. Override for custom formatting."""
-        self.logger.debug(f"Skipped: {record} (already exists)")
+        self.logger.debug("Skipped: %s (already exists)", record)
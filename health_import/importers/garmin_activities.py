@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
 
 from .base import BaseImporter
+from ..core.rollups import refresh_activity_rollups
 from ..transforms.datetime_utils import parse_garmin_datetime, parse_garmin_duration
 from ..transforms.units import pace_str_to_min_per_mile, meters_to_feet, cm_to_inches
 
@@ -20,6 +21,10 @@ class GarminActivitiesImporter(BaseImporter):
             for row in reader:
                 yield row
 
+    def _after_import(self) -> None:
+        """Rebuild dashboard activity rollups"""
+        refresh_activity_rollups(self.db.conn)
+
     def _process_record(self, record: Dict[str, Any]) -> str:
         """Process a single activity record"""
         # Parse datetime
@@ -206,4 +211,4 @@ class GarminActivitiesImporter(BaseImporter):
         """Log skip with activity details"""
         activity_type = record.get("Activity Type", "Unknown")
         date = record.get("Date", "")
-        self.logger.debug(f"Skipped: {activity_type} - {date} (already exists)")
+        self.logger.debug("Skipped: %s - %s (already exists)", activity_type, date)
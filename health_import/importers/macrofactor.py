@@ -5,6 +5,7 @@ from typing import Any, Dict, Iterator, Optional
 from datetime import datetime
 
 from .base import BaseImporter
+from ..core.rollups import refresh_nutrition_rollups
 
 
 class MacroFactorImporter(BaseImporter):
@@ -26,6 +27,10 @@ class MacroFactorImporter(BaseImporter):
                 record = {k.lower(): v for k, v in row.items()}
                 yield record
 
+    def _after_import(self) -> None:
+        """Rebuild dashboard nutrition rollups"""
+        refresh_nutrition_rollups(self.db.conn)
+
     def _process_record(self, record: Dict[str, Any]) -> str:
         """Process a single food entry record"""
         date_value = record.get("date")
@@ -128,4 +133,4 @@ class MacroFactorImporter(BaseImporter):
     def _log_skip(self, record: Dict[str, Any]) -> None:
         """Log skip"""
         date = record.get("date", "")
-        self.logger.debug(f"Skipped: nutrition {date} (already exists)")
+        self.logger.debug("Skipped: nutrition %s (already exists)", date)
@@ -148,4 +148,4 @@ class SixWeekImporter(BaseImporter):
         """Log skip"""
         date = record.get("Date", "")
         workout = record.get("Workout", "")
-        self.logger.debug(f"Skipped: {workout} - {date} (already exists)")
+        self.logger.debug("Skipped: %s - %s (already exists)", workout, date)
@@ -387,13 +387,19 @@ CREATE INDEX IF NOT EXISTS idx_activity_laps_activity ON activity_laps(activity_
 CREATE INDEX IF NOT EXISTS idx_activity_garmin_extras_garmin_id ON activity_garmin_extras(garmin_activity_id);
 CREATE INDEX IF NOT EXISTS idx_body_measurements_date ON body_measurements(measurement_date);
 CREATE INDEX IF NOT EXISTS idx_garmin_vo2max_date ON garmin_vo2max(measurement_date);
-CREATE INDEX IF NOT EXISTS idx_resting_hr_date ON resting_heart_rate(measurement_date);
+-- Covers lookups by date alone; replaces the old idx_resting_hr_date
+DROP INDEX IF EXISTS idx_resting_hr_date;
+CREATE INDEX IF NOT EXISTS idx_resting_hr_date_hidden ON resting_heart_rate(measurement_date, hidden, resting_hr);
 CREATE INDEX IF NOT EXISTS idx_nutrition_daily_date ON nutrition_daily(date);
+CREATE INDEX IF NOT EXISTS idx_nutrition_entries_date ON nutrition_entries(date);
 CREATE INDEX IF NOT EXISTS idx_strength_workouts_date ON strength_workouts(workout_date);
 CREATE INDEX IF NOT EXISTS idx_healthkit_records_type ON healthkit_records(record_type);
 CREATE INDEX IF NOT EXISTS idx_healthkit_records_time ON healthkit_records(start_time);
 CREATE INDEX IF NOT EXISTS idx_sleep_records_date ON sleep_records(date);
 CREATE INDEX IF NOT EXISTS idx_import_log_source ON import_log(source_id);
+CREATE INDEX IF NOT EXISTS idx_import_log_timestamp ON import_log(import_timestamp);
+CREATE INDEX IF NOT EXISTS idx_import_log_completed ON import_log(source_id, import_timestamp, records_inserted) WHERE status = 'completed';
+CREATE INDEX IF NOT EXISTS idx_import_conflicts_import ON import_conflicts(import_id);
 
 -- ============================================
 -- SEED DATA